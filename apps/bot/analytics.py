@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from apps.common.columnar import Column, ColumnarFile, ColumnarWriter
+from apps.common.database import Database
+
+FETCH_BATCH = 10_000
+_RELATIVE_STD_EPSILON = 1e-9
+
+
+def _epoch(raw: str) -> float:
+    value = datetime.fromisoformat(raw)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+@dataclass(frozen=True, slots=True)
+class ExportTable:
+    name: str
+    order_by: str
+    # Exported columns share names with the source table. Column 1 is always the row timestamp
+    # (``ts`` or ``date``) and is stored as epoch seconds.
+    columns: tuple[Column, ...]
+
+    @property
+    def source_columns(self) -> str:
+        return ", ".join(column.name for column in self.columns)
+
+
+EXPORT_TABLES = (
+    ExportTable(
+        name="equity_curve",
+        order_by="run_id, ts, id",
+        columns=(
+            Column("run_id", "str"),
+            Column("ts", "f8"),
+            Column("equity", "f8"),
+            Column("dd", "f8"),
+            Column("price", "f8"),
+        ),
+    ),
+    ExportTable(
+        name="trades",
+        order_by="run_id, ts, id",
+        columns=(
+            Column("run_id", "str"),
+            Column("ts", "f8"),
+            Column("side", "str"),
+            Column("qty", "f8"),
+            Column("entry", "f8"),
+            Column("exit", "f8"),
+            Column("pnl", "f8"),
+            Column("fees", "f8"),
+            Column("r_multiple", "f8"),
+            Column("reason_in", "str"),
+            Column("reason_out", "str"),
+        ),
+    ),
+    ExportTable(
+        name="metrics_daily",
+        order_by="run_id, date",
+        columns=(
+            Column("run_id", "str"),
+            Column("date", "f8"),
+            Column("win_rate", "f8"),
+            Column("avg_r", "f8"),
+            Column("expectancy", "f8"),
+            Column("max_dd", "f8"),
+            Column("sharpe", "f8"),
+            Column("trades_count", "i8"),
+        ),
+    ),
+)
+
+
+def list_run_ids(database: Database) -> list[str]:
+    with database.connect() as conn:
+        rows = conn.execute(
+            "SELECT run_id FROM equity_curve UNION SELECT run_id FROM trades "
+            "UNION SELECT run_id FROM metrics_daily ORDER BY run_id"
+        ).fetchall()
+    return [row["run_id"] for row in rows]
+
+
+def export_runs(
+    database: Database, out_dir: Path, run_ids: Sequence[str] | None = None
+) -> dict[str, Path]:
+    """Dump the selected runs into one ``<table>.col`` columnar file per table."""
+    if run_ids is None:
+        run_ids = list_run_ids(database)
+    placeholders = ", ".join("?" for _ in run_ids)
+    paths: dict[str, Path] = {}
+    with database.connect() as conn:
+        for table in EXPORT_TABLES:
+            path = out_dir / f"{table.name}.col"
+            cursor = conn.execute(
+                f"SELECT {table.source_columns} FROM {table.name} "  # noqa: S608
+                f"WHERE run_id IN ({placeholders}) ORDER BY {table.order_by}",
+                list(run_ids),
+            )
+            with ColumnarWriter(path, table.name, table.columns) as writer:
+                while batch := cursor.fetchmany(FETCH_BATCH):
+                    for row in batch:
+                        values: list[Any] = list(row)
+                        values[1] = _epoch(values[1])
+                        writer.append(values)
+            paths[table.name] = path
+    return paths
+
+
+@dataclass(slots=True)
+class RunStats:
+    run_id: str
+    samples: int = 0
+    start_equity: float = math.nan
+    end_equity: float = math.nan
+    total_return: float = 0.0
+    sharpe: float = 0.0
+    max_drawdown: float = 0.0
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    win_rate: float = 0.0
+    avg_r: float = 0.0
+    expectancy: float = 0.0
+    fees: float = 0.0
+
+
+@dataclass(slots=True)
+class _Accumulator:
+    samples: int = 0
+    first: float = math.nan
+    last: float = math.nan
+    peak: float = -math.inf
+    max_drawdown: float = 0.0
+    # Welford's running mean and sum of squared deviations of per-sample returns.
+    returns: int = 0
+    return_mean: float = 0.0
+    return_m2: float = 0.0
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    closed: int = 0
+    pnl_sum: float = 0.0
+    r_count: int = 0
+    r_sum: float = 0.0
+    fees: float = 0.0
+
+
+def _accumulate_equity(accumulators: list[_Accumulator], path: Path) -> list[str]:
+    with ColumnarFile(path) as export:
+        names = export.dictionaries["run_id"]
+        accumulators.extend(_Accumulator() for _ in names)
+        for chunk in export.iter_chunks(["run_id", "equity"]):
+            codes, equities = chunk["run_id"], chunk["equity"]
+            for code, equity in zip(codes, equities, strict=True):
+                acc = accumulators[code]
+                if acc.samples and acc.last > 0:
+                    change = equity / acc.last - 1.0
+                    acc.returns += 1
+                    delta = change - acc.return_mean
+                    acc.return_mean += delta / acc.returns
+                    acc.return_m2 += delta * (change - acc.return_mean)
+                elif not acc.samples:
+                    acc.first = equity
+                acc.samples += 1
+                acc.last = equity
+                if equity > acc.peak:
+                    acc.peak = equity
+                elif acc.peak > 0:
+                    drawdown = 1.0 - equity / acc.peak
+                    if drawdown > acc.max_drawdown:
+                        acc.max_drawdown = drawdown
+            codes.release()
+            equities.release()
+    return names
+
+
+def _accumulate_trades(accumulators: dict[str, _Accumulator], path: Path) -> None:
+    with ColumnarFile(path) as export:
+        names = export.dictionaries["run_id"]
+        by_code = [accumulators.setdefault(name, _Accumulator()) for name in names]
+        for chunk in export.iter_chunks(["run_id", "pnl", "fees", "r_multiple"]):
+            columns = (chunk["run_id"], chunk["pnl"], chunk["fees"], chunk["r_multiple"])
+            for code, pnl, fees, r_multiple in zip(*columns, strict=True):
+                acc = by_code[code]
+                acc.trades += 1
+                acc.fees += fees
+                if pnl == pnl:  # NaN marks an open trade
+                    acc.closed += 1
+                    acc.pnl_sum += pnl
+                    if pnl > 0:
+                        acc.wins += 1
+                    elif pnl < 0:
+                        acc.losses += 1
+                if r_multiple == r_multiple:
+                    acc.r_count += 1
+                    acc.r_sum += r_multiple
+            for column in columns:
+                column.release()
+
+
+def compare_runs(export_dir: Path) -> list[RunStats]:
+    """Compute per-run statistics for every run in an export with one scan per column file.
+
+    Rows are exported sorted by run, so each run's equity samples are contiguous and returns can
+    be accumulated in order. Sharpe is the mean over standard deviation of per-sample returns,
+    not annualised, since sample spacing depends on the poll interval of the run.
+    """
+    ordered: list[_Accumulator] = []
+    names = _accumulate_equity(ordered, export_dir / "equity_curve.col")
+    accumulators = dict(zip(names, ordered, strict=True))
+    _accumulate_trades(accumulators, export_dir / "trades.col")
+    return [_finalise(run_id, accumulators[run_id]) for run_id in sorted(accumulators)]
+
+
+def _finalise(run_id: str, acc: _Accumulator) -> RunStats:
+    stats = RunStats(
+        run_id=run_id,
+        samples=acc.samples,
+        start_equity=acc.first,
+        end_equity=acc.last,
+        max_drawdown=acc.max_drawdown,
+        trades=acc.trades,
+        wins=acc.wins,
+        losses=acc.losses,
+        fees=acc.fees,
+    )
+    if acc.samples and acc.first > 0:
+        stats.total_return = acc.last / acc.first - 1.0
+    if acc.returns > 1:
+        std = math.sqrt(acc.return_m2 / acc.returns)
+        # Rounding leaves a residual spread on constant returns; treat it as no variance.
+        if std > abs(acc.return_mean) * _RELATIVE_STD_EPSILON:
+            stats.sharpe = acc.return_mean / std
+    if acc.closed:
+        stats.win_rate = acc.wins / acc.closed
+        stats.expectancy = acc.pnl_sum / acc.closed
+    if acc.r_count:
+        stats.avg_r = acc.r_sum / acc.r_count
+    return stats
+
+
+def format_stats(stats: Iterable[RunStats]) -> str:
+    header = (
+        f"{'run_id':<24} {'return':>9} {'sharpe':>8} {'max_dd':>8} "
+        f"{'trades':>7} {'win%':>6} {'avg_r':>7} {'expect':>10}"
+    )
+    lines = [header]
+    for item in stats:
+        lines.append(
+            f"{item.run_id:<24} {item.total_return:>9.4%} {item.sharpe:>8.3f} "
+            f"{item.max_drawdown:>8.4%} {item.trades:>7d} {item.win_rate:>6.1%} "
+            f"{item.avg_r:>7.2f} {item.expectancy:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "EXPORT_TABLES",
+    "RunStats",
+    "compare_runs",
+    "export_runs",
+    "format_stats",
+    "list_run_ids",
+]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import struct
+from collections.abc import Sequence
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+# Slot layout: sequence counter, tick timestamp, last price, then the current candle's
+# bucket start and OHLC. Slots are padded to 64 bytes so each symbol sits on its own cache line.
+_SEQ = struct.Struct("<Q")
+_DATA = struct.Struct("<7d")
+SLOT_SIZE = 64
+_MAX_READ_ATTEMPTS = 1_000
+
+_TIMEFRAME_UNITS = {"m": 60, "h": 3_600, "d": 86_400}
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    try:
+        return int(timeframe[:-1]) * _TIMEFRAME_UNITS[timeframe[-1]]
+    except (KeyError, ValueError) as exc:
+        raise ValueError(f"Unsupported timeframe: {timeframe}") from exc
+
+
+@dataclass(frozen=True, slots=True)
+class BoardQuote:
+    ts: float
+    price: float
+    candle_start: float
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+class PriceBoard:
+    """Shared-memory table of the latest price and candle per symbol.
+
+    One feed process writes; any number of processes read without locks. Each slot is guarded by
+    a sequence counter (a seqlock): the writer makes it odd while updating and even afterwards, and
+    readers retry until they see the same even value before and after copying the data.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, symbols: Sequence[str]) -> None:
+        buf = memory.buf
+        if buf is None:
+            raise ValueError(f"Shared memory segment {memory.name} is closed")
+        self._memory = memory
+        self._buf = buf
+        self.symbols = tuple(symbols)
+        self._slots = {symbol: index * SLOT_SIZE for index, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def create(cls, symbols: Sequence[str]) -> PriceBoard:
+        memory = shared_memory.SharedMemory(create=True, size=max(len(symbols), 1) * SLOT_SIZE)
+        board = cls(memory, symbols)
+        board._buf[:] = bytes(memory.size)
+        return board
+
+    @classmethod
+    def attach(cls, name: str, symbols: Sequence[str]) -> PriceBoard:
+        # Child processes share the creator's resource tracker, so attaching does not transfer
+        # ownership; only the creator should call unlink().
+        return cls(shared_memory.SharedMemory(name=name), symbols)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def write(self, symbol: str, ts: float, price: float, candle_seconds: int) -> None:
+        offset = self._slots[symbol]
+        buf = self._buf
+        (seq,) = _SEQ.unpack_from(buf, offset)
+        # An odd counter means a previous feed died mid-update: its data may be torn, so start a
+        # fresh candle and round up to even so readers and later writes keep the right parity.
+        torn = seq & 1
+        seq += torn
+        previous = _DATA.unpack_from(buf, offset + _SEQ.size)
+        candle_start = ts - ts % candle_seconds
+        if seq and not torn and previous[2] == candle_start:
+            open_, high, low = previous[3], max(previous[4], price), min(previous[5], price)
+        else:
+            open_, high, low = price, price, price
+        _SEQ.pack_into(buf, offset, seq + 1)
+        _DATA.pack_into(buf, offset + _SEQ.size, ts, price, candle_start, open_, high, low, price)
+        _SEQ.pack_into(buf, offset, seq + 2)
+
+    def read(self, symbol: str) -> BoardQuote | None:
+        """Return the latest quote for ``symbol`` or ``None`` if the feed has not written it yet."""
+        offset = self._slots[symbol]
+        buf = self._buf
+        for _ in range(_MAX_READ_ATTEMPTS):
+            (before,) = _SEQ.unpack_from(buf, offset)
+            if before & 1:
+                continue
+            values = _DATA.unpack_from(buf, offset + _SEQ.size)
+            (after,) = _SEQ.unpack_from(buf, offset)
+            if before == after:
+                return None if before == 0 else BoardQuote(*values)
+        raise RuntimeError(f"Price board slot for {symbol} is not settling")
+
+    def close(self) -> None:
+        self._memory.close()
+
+    def unlink(self) -> None:
+        self._memory.unlink()
+
+
+__all__ = ["BoardQuote", "PriceBoard", "SLOT_SIZE", "timeframe_seconds"]
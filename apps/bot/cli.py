@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import json
 import logging
+from dataclasses import asdict
+from pathlib import Path
 
+from apps.bot.control import COMMANDS, send_control_command
 from apps.bot.loop import PaperBot
-from apps.bot.migrations import run_migrations
+from apps.bot.migrations import ensure_migrated, run_migrations
 from apps.common.config import BotConfig
+from apps.common.database import create_database
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +33,58 @@ def cmd_migrate(args: argparse.Namespace) -> None:
 def cmd_run(args: argparse.Namespace) -> None:
     config = BotConfig()
     config.ensure_paper_mode()
-    run_migrations(config.db_url)
+    ensure_migrated(config.db_url)
     configure_logging(args.verbose)
     logger.info("Starting paper bot", extra={"symbol": config.symbol, "mode": config.mode})
-    asyncio.run(PaperBot.run_from_env(max_ticks=args.max_ticks))
+    asyncio.run(PaperBot.run_from_env(max_ticks=args.max_ticks, config=config))
+
+
+def cmd_ctl(args: argparse.Namespace) -> None:
+    config = BotConfig()
+    try:
+        reply = send_control_command(config.control_socket, " ".join([args.action, *args.args]))
+    except (OSError, json.JSONDecodeError) as exc:
+        # No bot listening, a stale socket, or the connection dropped before a reply.
+        reply = {"ok": False, "error": f"{config.control_socket}: {type(exc).__name__}: {exc}"}
+    print(json.dumps(reply))  # noqa: T201
+    if not reply.get("ok"):
+        raise SystemExit(1)
+
+
+def cmd_supervise(args: argparse.Namespace) -> None:
+    # multiprocessing and shared memory are only needed here; keep them off the run/migrate path.
+    from apps.bot.supervisor import Supervisor
+
+    config = BotConfig()
+    config.ensure_paper_mode()
+    configure_logging(args.verbose)
+    symbols = [symbol.strip().upper() for symbol in args.symbols.split(",") if symbol.strip()]
+    logger.info(
+        "Starting supervisor",
+        extra={"symbols": symbols, "workers": args.workers, "mode": config.mode},
+    )
+    Supervisor(config, symbols, workers=args.workers, max_ticks=args.max_ticks).run()
+
+
+def cmd_export(args: argparse.Namespace) -> None:
+    from apps.bot.analytics import export_runs
+
+    config = BotConfig()
+    ensure_migrated(config.db_url)
+    run_ids = args.runs.split(",") if args.runs else None
+    paths = export_runs(create_database(config.db_url), Path(args.out), run_ids)
+    for table, path in paths.items():
+        print(f"{table}: {path}")  # noqa: T201
+
+
+def cmd_analyze(args: argparse.Namespace) -> None:
+    from apps.bot.analytics import compare_runs, format_stats
+
+    stats = compare_runs(Path(args.export_dir))
+    if args.json:
+        print(json.dumps([asdict(item) for item in stats], indent=2))  # noqa: T201
+    else:
+        print(format_stats(stats))  # noqa: T201
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -48,6 +101,38 @@ def build_parser() -> argparse.ArgumentParser:
     run_parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
     run_parser.set_defaults(func=cmd_run)
 
+    ctl_parser = subparsers.add_parser("ctl", help="Send a command to a running paper bot")
+    ctl_parser.add_argument("action", choices=sorted(COMMANDS), help="Control command")
+    ctl_parser.add_argument("args", nargs="*", help="Arguments, e.g. poll_interval_seconds=5")
+    ctl_parser.set_defaults(func=cmd_ctl)
+
+    supervise_parser = subparsers.add_parser(
+        "supervise", help="Run the paper loop for many symbols across worker processes"
+    )
+    supervise_parser.add_argument(
+        "--symbols", required=True, help="Comma-separated symbols, e.g. BTCUSDT,ETHUSDT"
+    )
+    supervise_parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+    supervise_parser.add_argument(
+        "--max-ticks", type=int, default=None, help="Number of ticks per symbol before exit"
+    )
+    supervise_parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
+    supervise_parser.set_defaults(func=cmd_supervise)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export runs to columnar files for cross-run analytics"
+    )
+    export_parser.add_argument("--out", required=True, help="Output directory")
+    export_parser.add_argument(
+        "--runs", default=None, help="Comma-separated run ids (default: every run)"
+    )
+    export_parser.set_defaults(func=cmd_export)
+
+    analyze_parser = subparsers.add_parser("analyze", help="Compare runs from a columnar export")
+    analyze_parser.add_argument("export_dir", help="Directory written by the export command")
+    analyze_parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    analyze_parser.set_defaults(func=cmd_analyze)
+
     return parser
 
 
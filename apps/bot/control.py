@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import signal
+import socket
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+COMMANDS = frozenset({"stop", "pause", "resume", "flush", "reload", "status"})
+SIGNAL_COMMANDS = {
+    signal.SIGTERM: "stop",
+    signal.SIGINT: "stop",
+    signal.SIGHUP: "reload",
+    signal.SIGUSR1: "flush",
+}
+MAX_COMMAND_BYTES = 4_096
+CLIENT_READ_TIMEOUT_SECONDS = 5.0
+
+# Receives the command name and its arguments and returns a JSON-serialisable reply.
+CommandHandler = Callable[[str, list[str]], dict[str, Any]]
+
+
+def parse_command(line: str) -> tuple[str, list[str]]:
+    parts = line.split()
+    if not parts:
+        raise ValueError("Empty control command")
+    command, args = parts[0].lower(), parts[1:]
+    if command not in COMMANDS:
+        raise ValueError(f"Unknown control command: {command}")
+    return command, args
+
+
+class ControlServer:
+    """Unix socket accepting one command line per connection and answering with one JSON line."""
+
+    def __init__(self, path: Path, handler: CommandHandler) -> None:
+        self.path = path
+        self.handler = handler
+        self._server: asyncio.AbstractServer | None = None
+        self._identity: tuple[int, int] | None = None
+        self._clients: dict[asyncio.Task[None], asyncio.StreamWriter] = {}
+
+    async def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.is_socket():
+            if _socket_accepts(self.path):
+                raise RuntimeError(f"Control socket {self.path} is in use by another process")
+            # Left behind by a crashed process; it would make bind() fail.
+            self.path.unlink()
+        # Bind with a restrictive umask so the socket is never reachable by other users, not even
+        # for the moment between bind() and a chmod().
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=str(self.path))
+        finally:
+            os.umask(previous_umask)
+        stat = self.path.stat()
+        self._identity = (stat.st_dev, stat.st_ino)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Drop connected clients so their handlers finish (and wait_closed(), which waits for
+            # open connections on newer Pythons, returns) instead of waiting on a silent client.
+            handlers = list(self._clients)
+            for writer in self._clients.values():
+                writer.transport.abort()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._identity is not None:
+            # Only remove the socket this server bound; another process may own the path by now.
+            with contextlib.suppress(FileNotFoundError):
+                stat = self.path.stat()
+                if (stat.st_dev, stat.st_ino) == self._identity:
+                    self.path.unlink()
+            self._identity = None
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # One command per connection keeps no handler waiting on a client once it is answered, so
+        # stopping the loop never has to cancel in-flight connections.
+        task = asyncio.current_task()
+        assert task is not None
+        self._clients[task] = writer
+        try:
+            try:
+                line = await asyncio.wait_for(reader.readline(), CLIENT_READ_TIMEOUT_SECONDS)
+            except TimeoutError:
+                logger.debug("control_client_timed_out")
+                return
+            if not line:
+                # The client hung up, or close() dropped it.
+                return
+            if len(line) > MAX_COMMAND_BYTES:
+                reply: dict[str, Any] = {"ok": False, "error": "Command too long"}
+            else:
+                try:
+                    command, args = parse_command(line.decode())
+                    reply = {"ok": True, **self.handler(command, args)}
+                except ValueError as exc:
+                    reply = {"ok": False, "error": str(exc)}
+                except Exception as exc:
+                    logger.exception("control_command_failed")
+                    reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+        except (ConnectionError, UnicodeDecodeError, ValueError):
+            logger.debug("control_client_dropped")
+        finally:
+            del self._clients[task]
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+def _socket_accepts(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+def install_signal_handlers(
+    loop: asyncio.AbstractEventLoop, handler: CommandHandler
+) -> list[signal.Signals]:
+    installed: list[signal.Signals] = []
+    for signum, command in SIGNAL_COMMANDS.items():
+        try:
+            loop.add_signal_handler(signum, _run_signal_command, handler, command)
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Not the main thread, or a platform without signal support in the event loop.
+            continue
+        installed.append(signum)
+    return installed
+
+
+def _run_signal_command(handler: CommandHandler, command: str) -> None:
+    try:
+        handler(command, [])
+    except Exception:
+        logger.exception("signal_command_failed", extra={"command": command})
+
+
+def remove_signal_handlers(loop: asyncio.AbstractEventLoop, signums: list[signal.Signals]) -> None:
+    for signum in signums:
+        loop.remove_signal_handler(signum)
+
+
+def send_control_command(path: Path, command: str, *, timeout: float = 5.0) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(path))
+        client.sendall(command.encode() + b"\n")
+        with client.makefile("rb") as stream:
+            return json.loads(stream.readline())
+
+
+__all__ = [
+    "COMMANDS",
+    "CommandHandler",
+    "ControlServer",
+    "install_signal_handlers",
+    "parse_command",
+    "remove_signal_handlers",
+    "send_control_command",
+]
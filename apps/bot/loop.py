@@ -1,18 +1,42 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
 from datetime import UTC, date, datetime
 from pathlib import Path
 from random import random
+from typing import Any, Protocol
 
 from apps.bot.binance import fetch_latest_price
-from apps.common.config import BotConfig
+from apps.bot.control import ControlServer, install_signal_handlers, remove_signal_handlers
+from apps.bot.migrations import ensure_migrated
+from apps.common.config import BotConfig, read_settings_file
 from apps.common.database import Database, create_database
 
 logger = logging.getLogger(__name__)
 
+PriceFeed = Callable[[str], Awaitable[float]]
+
+# Settings that can change on a running loop through the "reload" control command. In
+# ``SETTINGS_FILE`` they use their environment variable names (the field name upper-cased).
+# Reloaded values must satisfy ``low < value <= high``: a zero interval would make the loop tick,
+# or the stop watcher stat the kill switch, as fast as the event loop allows.
+_RELOAD_LIMITS: dict[str, tuple[float, float]] = {
+    "poll_interval_seconds": (0, 86_400),
+    "risk_per_trade": (0, 1),
+    "daily_max_drawdown": (0, 1),
+    "candles_limit": (0, 1_000),
+    "kill_switch_poll_seconds": (0, 3_600),
+}
+RELOADABLE_FIELDS = tuple(_RELOAD_LIMITS)
+
+
+class StopFlag(Protocol):
+    def is_set(self) -> bool: ...
+
 
 @dataclass(slots=True)
 class LoopState:
@@ -22,31 +46,175 @@ class LoopState:
 
 
 class PaperBot:
-    def __init__(self, config: BotConfig, database: Database) -> None:
+    def __init__(
+        self,
+        config: BotConfig,
+        database: Database,
+        *,
+        price_feed: PriceFeed = fetch_latest_price,
+        stop_flag: StopFlag | None = None,
+    ) -> None:
         config.ensure_paper_mode()
         self.config = config
         self.database = database
+        self.price_feed = price_feed
+        self.stop_flag = stop_flag
         self.state = LoopState(equity=100_000.0, peak_equity=100_000.0)
+        self.tick = 0
+        self.paused = False
+        self._stop_requested = False
+        self._wake = asyncio.Event()
+
+    async def run(
+        self,
+        *,
+        max_ticks: int | None = None,
+        control_socket: Path | None = None,
+        handle_signals: bool = False,
+    ) -> None:
+        """Run the tick loop until ``max_ticks``, a stop command, or the kill switch.
 
-    async def run(self, *, max_ticks: int | None = None) -> None:
-        tick = 0
+        Stop requests from the control socket, signals, the supervisor's stop flag or the kill
+        switch file wake the loop immediately instead of waiting out the poll interval.
+        """
+        loop = asyncio.get_running_loop()
+        self._check_stop_sources()
+        server = None
+        if control_socket is not None:
+            server = ControlServer(control_socket, self.handle_command)
+            await server.start()
+        signums = install_signal_handlers(loop, self.handle_command) if handle_signals else []
+        watcher = asyncio.create_task(self._watch_stop_sources())
+        try:
+            await self._run_ticks(max_ticks)
+        finally:
+            watcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await watcher
+            remove_signal_handlers(loop, signums)
+            if server is not None:
+                await server.close()
+
+    async def _run_ticks(self, max_ticks: int | None) -> None:
+        loop = asyncio.get_running_loop()
+        ticks_this_run = 0
         while True:
             if self._should_stop():
-                logger.info("Kill switch detected; stopping bot loop")
+                logger.info("Stop requested; stopping bot loop")
                 break
+            if self.paused:
+                await self._sleep(None)
+                continue
 
-            price = await fetch_latest_price(self.config.symbol)
-            tick += 1
-            await self._on_tick(price, tick)
+            price = await self.price_feed(self.config.symbol)
+            if self._should_stop():
+                continue
+            self.tick += 1
+            ticks_this_run += 1
+            await self._on_tick(price, self.tick)
 
-            if max_ticks is not None and tick >= max_ticks:
+            if max_ticks is not None and ticks_this_run >= max_ticks:
                 break
 
-            await asyncio.sleep(self.config.poll_interval_seconds)
+            await self._wait_for_next_tick(loop.time())
+
+    async def _wait_for_next_tick(self, last_tick: float) -> None:
+        # Reload and flush wake the loop as well: re-check the deadline so a new poll interval
+        # applies to the current wait without costing an extra tick per command.
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = last_tick + self.config.poll_interval_seconds - loop.time()
+            await self._sleep(max(remaining, 0))
+            if remaining <= 0 or self._should_stop() or self.paused:
+                return
+
+    async def _sleep(self, seconds: float | None) -> None:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wake.wait(), seconds)
+        self._wake.clear()
 
     def _should_stop(self) -> bool:
-        kill_file = Path(self.config.kill_switch_file)
-        return kill_file.exists()
+        return self._stop_requested
+
+    def _check_stop_sources(self) -> None:
+        if self._stop_requested:
+            return
+        if self.stop_flag is not None and self.stop_flag.is_set():
+            self.handle_command("stop", [])
+        elif Path(self.config.kill_switch_file).exists():
+            logger.info("Kill switch detected")
+            self.handle_command("stop", [])
+
+    async def _watch_stop_sources(self) -> None:
+        # The kill switch file and the supervisor's stop flag are polled at their own cadence, so
+        # neither costs a stat per tick nor waits for the tick's sleep to finish.
+        while not self._stop_requested:
+            await asyncio.sleep(self.config.kill_switch_poll_seconds)
+            self._check_stop_sources()
+
+    def handle_command(self, command: str, args: list[str]) -> dict[str, Any]:
+        logger.info("control_command", extra={"command": command, "command_args": args})
+        reply: dict[str, Any] = {}
+        if command == "stop":
+            self._stop_requested = True
+            self._wake.set()
+        elif command == "pause":
+            self.paused = True
+        elif command == "resume":
+            if self.paused:
+                self.paused = False
+                self._wake.set()
+        elif command == "flush":
+            reply["flushed"] = self.database.flush()
+            self._wake.set()
+        elif command == "reload":
+            reply["reloaded"] = self.reload_config(args)
+            self._wake.set()
+        elif command != "status":
+            raise ValueError(f"Unknown control command: {command}")
+        return {**reply, **self.status()}
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "run_id": self.config.run_id,
+            "symbol": self.config.symbol,
+            "tick": self.tick,
+            "paused": self.paused,
+            "stopping": self._stop_requested,
+            "poll_interval_seconds": self.config.poll_interval_seconds,
+        }
+
+    def reload_config(self, overrides: list[str]) -> list[str]:
+        """Apply ``key=value`` overrides, or re-read ``SETTINGS_FILE`` when none are given.
+
+        Settings that are not mentioned keep their current values. Returns the changed fields.
+        """
+        if not overrides and self.config.settings_file is not None:
+            settings = read_settings_file(self.config.settings_file)
+            overrides = [
+                f"{name}={settings[name.upper()]}"
+                for name in RELOADABLE_FIELDS
+                if name.upper() in settings
+            ]
+        updates: dict[str, Any] = {}
+        for item in overrides:
+            name, sep, raw = item.partition("=")
+            if not sep or name not in RELOADABLE_FIELDS:
+                raise ValueError(f"Cannot reload {item!r}; expected one of {RELOADABLE_FIELDS}")
+            kind = type(getattr(self.config, name))
+            try:
+                value = kind(raw)
+            except ValueError as exc:
+                raise ValueError(f"{name} must be {kind.__name__}") from exc
+            low, high = _RELOAD_LIMITS[name]
+            if not low < value <= high:
+                raise ValueError(f"{name} must be greater than {low} and at most {high}")
+            updates[name] = value
+        changed = [name for name, value in updates.items() if getattr(self.config, name) != value]
+        self.config = replace(self.config, **updates)
+        if changed:
+            logger.info("config_reloaded", extra={"fields": changed})
+        return changed
 
     async def _on_tick(self, price: float, tick: int) -> None:
         now = datetime.now(UTC)
@@ -75,6 +243,7 @@ class PaperBot:
             ts=now,
             equity=self.state.equity,
             drawdown=drawdown,
+            price=price,
         )
 
         self.database.upsert_daily_metrics(
@@ -89,11 +258,16 @@ class PaperBot:
         )
 
     @classmethod
-    async def run_from_env(cls, *, max_ticks: int | None = None) -> None:
-        config = BotConfig()
+    async def run_from_env(
+        cls, *, max_ticks: int | None = None, config: BotConfig | None = None
+    ) -> None:
+        config = config or BotConfig()
+        ensure_migrated(config.db_url)
         database = create_database(config.db_url)
         bot = cls(config=config, database=database)
-        await bot.run(max_ticks=max_ticks)
+        await bot.run(
+            max_ticks=max_ticks, control_socket=config.control_socket, handle_signals=True
+        )
 
 
-__all__ = ["PaperBot", "LoopState"]
+__all__ = ["PaperBot", "LoopState", "PriceFeed", "RELOADABLE_FIELDS", "StopFlag"]
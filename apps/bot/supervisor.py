@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any
+
+from apps.bot.binance import fetch_latest_price
+from apps.bot.board import PriceBoard, timeframe_seconds
+from apps.bot.loop import PaperBot, PriceFeed
+from apps.bot.migrations import ensure_migrated
+from apps.common.config import BotConfig
+from apps.common.database import Database, resolve_sqlite_path
+from apps.common.memory_database import create_memory_database
+
+logger = logging.getLogger(__name__)
+
+WRITER_BATCH = 1_000
+MONITOR_INTERVAL_SECONDS = 0.5
+BOARD_WAIT_SECONDS = 0.05
+SHUTDOWN_TIMEOUT_SECONDS = 10.0
+PARENT_CHECK_SECONDS = 0.5
+WRITE_METHODS = frozenset({"insert_equity_point", "upsert_daily_metrics", "insert_trade"})
+
+
+def shard_symbols(symbols: Sequence[str], workers: int) -> list[tuple[str, ...]]:
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    shards = [tuple(symbols[index::workers]) for index in range(workers)]
+    return [shard for shard in shards if shard]
+
+
+@dataclass(slots=True)
+class QueueDatabase(Database):
+    """Database whose writes are forwarded to the supervisor's single writer process.
+
+    Reads still go straight to ``path``; only the insert/upsert methods are redirected.
+    """
+
+    write_queue: Any = field(default=None, repr=False)
+
+    def insert_equity_point(
+        self,
+        run_id: str,
+        ts: datetime,
+        equity: float,
+        drawdown: float,
+        price: float | None = None,
+    ) -> None:
+        self.write_queue.put(("insert_equity_point", (run_id, ts, equity, drawdown, price), {}))
+
+    def upsert_daily_metrics(self, run_id: str, day: date, **metrics: Any) -> None:
+        self.write_queue.put(("upsert_daily_metrics", (run_id, day), metrics))
+
+    def insert_trade(self, **fields: Any) -> None:
+        self.write_queue.put(("insert_trade", (), fields))
+
+
+class _ShutdownFlag:
+    """Stop flag for child processes: set by the supervisor, or implied once it has died.
+
+    An orphaned child is reparented, so a changed parent pid means nobody will ever set the
+    shared event and the child has to stop on its own.
+    """
+
+    def __init__(self, stop_event: Any) -> None:
+        self._stop_event = stop_event
+        self._parent_pid = os.getppid()
+
+    def is_set(self) -> bool:
+        return self._stop_event.is_set() or os.getppid() != self._parent_pid
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while not self.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._stop_event.wait(min(remaining, PARENT_CHECK_SECONDS))
+        return True
+
+
+def _apply_write(buffer: Database, operation: tuple[str, tuple[Any, ...], dict[str, Any]]) -> None:
+    method, args, kwargs = operation
+    if method not in WRITE_METHODS:
+        raise ValueError(f"Unsupported write operation: {method}")
+    getattr(buffer, method)(*args, **kwargs)
+
+
+def run_db_writer(db_url: str, write_queue: Any) -> None:
+    """Apply queued writes in batches, each persisted in one transaction, until a ``None``.
+
+    Whatever is buffered is flushed on the way out, and if the supervisor dies the queue is
+    drained first so writes already sent by workers are not lost.
+    """
+    parent_pid = os.getppid()
+    ensure_migrated(db_url)
+    buffer = create_memory_database(db_url)
+    try:
+        while True:
+            try:
+                operation = write_queue.get(timeout=PARENT_CHECK_SECONDS)
+            except queue.Empty:
+                if os.getppid() != parent_pid:
+                    logger.warning("db_writer_orphaned")
+                    _drain(write_queue, buffer)
+                    return
+                continue
+            if operation is None:
+                return
+            _apply_write(buffer, operation)
+            for _ in range(WRITER_BATCH - 1):
+                try:
+                    operation = write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if operation is None:
+                    return
+                _apply_write(buffer, operation)
+            buffer.flush()
+    finally:
+        try:
+            buffer.flush()
+        finally:
+            buffer.close()
+
+
+def _drain(write_queue: Any, buffer: Database) -> None:
+    while True:
+        try:
+            operation = write_queue.get_nowait()
+        except queue.Empty:
+            return
+        if operation is None:
+            return
+        _apply_write(buffer, operation)
+
+
+def _child_main(target: Callable[..., None], *args: Any) -> None:
+    # Ctrl-C reaches the whole process group; shutdown is the supervisor's job, so children
+    # ignore SIGINT and stop through the shared event instead. SIGTERM goes back to the default
+    # (forked children inherit the supervisor's handler) so a stuck child can be terminated.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    target(*args)
+
+
+class _Stopped(Exception):
+    pass
+
+
+def run_feed(
+    board_name: str,
+    symbols: Sequence[str],
+    stop_event: Any,
+    interval: float,
+    timeframe: str,
+    fetch_price: PriceFeed = fetch_latest_price,
+) -> None:
+    board = PriceBoard.attach(board_name, symbols)
+    candle_seconds = timeframe_seconds(timeframe)
+    stop_flag = _ShutdownFlag(stop_event)
+
+    async def _loop() -> None:
+        while not stop_flag.is_set():
+            prices = await asyncio.gather(*(fetch_price(symbol) for symbol in symbols))
+            now = time.time()
+            for symbol, price in zip(symbols, prices, strict=True):
+                board.write(symbol, now, price, candle_seconds)
+            await asyncio.to_thread(stop_flag.wait, interval)
+
+    try:
+        asyncio.run(_loop())
+    finally:
+        board.close()
+
+
+def run_worker(
+    config: BotConfig,
+    symbols: Sequence[str],
+    board_name: str,
+    board_symbols: Sequence[str],
+    write_queue: Any,
+    stop_event: Any,
+    max_ticks: int | None,
+) -> None:
+    board = PriceBoard.attach(board_name, board_symbols)
+    database = QueueDatabase(path=resolve_sqlite_path(config.db_url), write_queue=write_queue)
+    stop_flag = _ShutdownFlag(stop_event)
+
+    async def board_price(symbol: str) -> float:
+        while (quote := board.read(symbol)) is None:
+            if stop_flag.is_set():
+                raise _Stopped
+            await asyncio.sleep(BOARD_WAIT_SECONDS)
+        return quote.price
+
+    bots = [
+        PaperBot(
+            replace(config, symbol=symbol, run_id=f"{config.run_id}_{symbol}"),
+            database,
+            price_feed=board_price,
+            stop_flag=stop_flag,
+        )
+        for symbol in symbols
+    ]
+
+    async def _run() -> None:
+        await asyncio.gather(*(bot.run(max_ticks=max_ticks) for bot in bots))
+
+    try:
+        asyncio.run(_run())
+    except _Stopped:
+        pass
+    finally:
+        board.close()
+
+
+class Supervisor:
+    """Run a price feed, sharded bot workers and one database writer as separate processes.
+
+    The feed is the only process talking to Binance; workers read its prices from a shared
+    :class:`PriceBoard` and send writes to the writer over a queue. The supervisor turns the kill
+    switch into a shared stop event and restarts processes that exit abnormally.
+    """
+
+    def __init__(
+        self,
+        config: BotConfig,
+        symbols: Sequence[str],
+        *,
+        workers: int,
+        max_ticks: int | None = None,
+        fetch_price: PriceFeed = fetch_latest_price,
+        max_restarts: int = 5,
+    ) -> None:
+        config.ensure_paper_mode()
+        if not symbols:
+            raise ValueError("Supervisor needs at least one symbol")
+        self.config = config
+        self.symbols = tuple(symbols)
+        self.shards = shard_symbols(self.symbols, workers)
+        self.max_ticks = max_ticks
+        self.fetch_price = fetch_price
+        self.max_restarts = max_restarts
+        self.restarts: dict[str, int] = {}
+        self._context = multiprocessing.get_context()
+        self.stop_event = self._context.Event()
+        self.write_queue = self._context.Queue()
+        self._board: PriceBoard | None = None
+        self._processes: dict[str, BaseProcess] = {}
+        self._stop_signal: int | None = None
+
+    def run(self) -> None:
+        ensure_migrated(self.config.db_url)
+        previous_handlers = self._install_signal_handlers()
+        self._board = PriceBoard.create(self.symbols)
+        try:
+            self._start("writer")
+            self._start("feed")
+            for index in range(len(self.shards)):
+                self._start(f"worker-{index}")
+            self._monitor()
+        except KeyboardInterrupt:
+            logger.info("Supervisor interrupted; stopping workers")
+        finally:
+            self._shutdown()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def _install_signal_handlers(self) -> dict[signal.Signals, Any]:
+        # SIGTERM (container stop) and SIGINT both become a graceful stop: the monitor sees the
+        # request, sets the stop event, waits for workers to finish and _shutdown drains the writer.
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+        previous: dict[signal.Signals, Any] = {}
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            previous[signum] = signal.signal(signum, self._handle_signal)
+        return previous
+
+    def _handle_signal(self, signum: int, frame: Any) -> None:
+        # Only record the request: the handler can interrupt the main thread while it holds the
+        # stop event's lock inside wait(), so setting the event here would deadlock.
+        self._stop_signal = signum
+
+    def _monitor(self) -> None:
+        kill_file = Path(self.config.kill_switch_file)
+        while True:
+            if not self.stop_event.is_set() and self._stop_signal is not None:
+                logger.info(
+                    "Supervisor received signal; stopping workers",
+                    extra={"signal": self._stop_signal},
+                )
+                self.stop_event.set()
+            if not self.stop_event.is_set() and kill_file.exists():
+                logger.info("Kill switch detected; stopping all workers")
+                self.stop_event.set()
+            workers = [name for name in self._processes if name.startswith("worker-")]
+            for name, process in list(self._processes.items()):
+                if process.is_alive() or process.exitcode == 0 or self.stop_event.is_set():
+                    continue
+                self._restart(name, process.exitcode)
+            if all(not self._processes[name].is_alive() for name in workers):
+                return
+            self.stop_event.wait(MONITOR_INTERVAL_SECONDS)
+
+    def _restart(self, name: str, exitcode: int | None) -> None:
+        count = self.restarts.get(name, 0) + 1
+        self.restarts[name] = count
+        if count > self.max_restarts:
+            logger.error(
+                "process_restart_limit", extra={"process_name": name, "exitcode": exitcode}
+            )
+            self.stop_event.set()
+            return
+        logger.warning("process_restart", extra={"process_name": name, "exitcode": exitcode})
+        self._start(name)
+
+    def _start(self, name: str) -> None:
+        assert self._board is not None
+        if name == "writer":
+            target: Any = run_db_writer
+            args: tuple[Any, ...] = (self.config.db_url, self.write_queue)
+        elif name == "feed":
+            target = run_feed
+            args = (
+                self._board.name,
+                self.symbols,
+                self.stop_event,
+                float(self.config.poll_interval_seconds),
+                self.config.timeframe,
+                self.fetch_price,
+            )
+        else:
+            shard = self.shards[int(name.removeprefix("worker-"))]
+            target = run_worker
+            args = (
+                self.config,
+                shard,
+                self._board.name,
+                self.symbols,
+                self.write_queue,
+                self.stop_event,
+                self.max_ticks,
+            )
+        process = self._context.Process(
+            target=_child_main, args=(target, *args), name=f"tdi-{name}"
+        )
+        process.start()
+        self._processes[name] = process
+
+    def _shutdown(self) -> None:
+        self.stop_event.set()
+        for name, process in self._processes.items():
+            if name != "writer":
+                _join(process)
+        self.write_queue.put(None)
+        writer = self._processes.get("writer")
+        if writer is not None:
+            _join(writer)
+        if self._board is not None:
+            self._board.close()
+            self._board.unlink()
+            self._board = None
+
+
+def _join(process: BaseProcess) -> None:
+    process.join(SHUTDOWN_TIMEOUT_SECONDS)
+    if process.is_alive():
+        logger.warning("process_terminate", extra={"process_name": process.name})
+        process.terminate()
+        process.join()
+
+
+__all__ = [
+    "QueueDatabase",
+    "Supervisor",
+    "run_db_writer",
+    "run_feed",
+    "run_worker",
+    "shard_symbols",
+]
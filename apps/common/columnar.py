@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Literal
+
+MAGIC = b"TDICOL1\0"
+CHUNK_ROWS = 65_536
+ALIGNMENT = 8
+_FOOTER_LENGTH = struct.Struct("<Q")
+
+# Column types map to ``array`` typecodes. "str" columns are dictionary-encoded into int32 codes
+# with -1 for NULL; NULL floats are stored as NaN.
+TYPECODES: dict[str, Literal["d", "q", "i"]] = {"f8": "d", "i8": "q", "str": "i"}
+
+
+@dataclass(frozen=True, slots=True)
+class Column:
+    name: str
+    type: str
+
+
+class ColumnarWriter:
+    """Write rows as chunks of typed, 8-byte aligned column arrays followed by a JSON footer.
+
+    Layout: ``MAGIC``, chunk column buffers, footer JSON, footer length (uint64 LE), ``MAGIC``.
+    The footer records every buffer's offset so readers can map columns without copying.
+    """
+
+    def __init__(self, path: Path, table: str, columns: Sequence[Column]) -> None:
+        for column in columns:
+            if column.type not in TYPECODES:
+                raise ValueError(f"Unsupported column type: {column.type}")
+        self.path = path
+        self.table = table
+        self.columns = tuple(columns)
+        self._dictionaries: dict[str, dict[str, int]] = {
+            column.name: {} for column in self.columns if column.type == "str"
+        }
+        self._buffers = self._empty_buffers()
+        self._rows_in_chunk = 0
+        self._chunks: list[dict[str, Any]] = []
+        self._handle: BinaryIO | None = None
+
+    def __enter__(self) -> ColumnarWriter:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.path.open("wb")
+        self._handle.write(MAGIC)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        assert self._handle is not None
+        try:
+            if exc_type is None:
+                self._flush_chunk()
+                self._write_footer()
+        finally:
+            self._handle.close()
+            self._handle = None
+
+    def append(self, row: Sequence[Any]) -> None:
+        for column, value, buffer in zip(self.columns, row, self._buffers, strict=True):
+            if column.type == "str":
+                if value is None:
+                    buffer.append(-1)
+                else:
+                    codes = self._dictionaries[column.name]
+                    buffer.append(codes.setdefault(value, len(codes)))
+            elif column.type == "f8":
+                buffer.append(math.nan if value is None else float(value))
+            else:
+                buffer.append(int(value))
+        self._rows_in_chunk += 1
+        if self._rows_in_chunk >= CHUNK_ROWS:
+            self._flush_chunk()
+
+    def extend(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def _empty_buffers(self) -> list[array]:
+        return [array(TYPECODES[column.type]) for column in self.columns]
+
+    def _flush_chunk(self) -> None:
+        if not self._rows_in_chunk:
+            return
+        assert self._handle is not None
+        offsets: dict[str, list[int]] = {}
+        for column, buffer in zip(self.columns, self._buffers, strict=True):
+            offset = self._handle.tell()
+            data = buffer.tobytes()
+            self._handle.write(data)
+            self._handle.write(b"\0" * (-len(data) % ALIGNMENT))
+            offsets[column.name] = [offset, len(data)]
+        self._chunks.append({"rows": self._rows_in_chunk, "columns": offsets})
+        self._buffers = self._empty_buffers()
+        self._rows_in_chunk = 0
+
+    def _write_footer(self) -> None:
+        assert self._handle is not None
+        footer = {
+            "table": self.table,
+            "byteorder": sys.byteorder,
+            "columns": [{"name": column.name, "type": column.type} for column in self.columns],
+            "dictionaries": {name: list(codes) for name, codes in self._dictionaries.items()},
+            "chunks": self._chunks,
+        }
+        payload = json.dumps(footer, separators=(",", ":")).encode()
+        self._handle.write(payload)
+        self._handle.write(_FOOTER_LENGTH.pack(len(payload)))
+        self._handle.write(MAGIC)
+
+
+class ColumnarFile:
+    """Memory-mapped reader; column buffers are exposed as zero-copy typed ``memoryview``s."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        tail = len(MAGIC) + _FOOTER_LENGTH.size
+        if self._mmap[: len(MAGIC)] != MAGIC or self._mmap[-len(MAGIC) :] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a columnar export: {path}")
+        (footer_length,) = _FOOTER_LENGTH.unpack_from(self._mmap, len(self._mmap) - tail)
+        footer_start = len(self._mmap) - tail - footer_length
+        footer = json.loads(self._mmap[footer_start : footer_start + footer_length])
+        if footer["byteorder"] != sys.byteorder:
+            self._mmap.close()
+            raise ValueError(f"Columnar export {path} was written with {footer['byteorder']} order")
+        self.table: str = footer["table"]
+        self.columns = tuple(Column(**column) for column in footer["columns"])
+        self.dictionaries: dict[str, list[str]] = footer["dictionaries"]
+        self._chunks: list[dict[str, Any]] = footer["chunks"]
+        self._types = {column.name: column.type for column in self.columns}
+
+    def __enter__(self) -> ColumnarFile:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    @property
+    def num_rows(self) -> int:
+        return sum(chunk["rows"] for chunk in self._chunks)
+
+    def iter_chunks(
+        self, names: Sequence[str] | None = None
+    ) -> Iterator[dict[str, memoryview[Any]]]:
+        """Yield each chunk's columns as typed views into the map.
+
+        The views are released once the consumer moves to the next chunk or stops iterating, so
+        they must not be kept; closing the file while any view is alive raises ``BufferError``.
+        """
+        names = list(self._types) if names is None else list(names)
+        view = memoryview(self._mmap)
+        try:
+            for chunk in self._chunks:
+                columns: dict[str, memoryview[Any]] = {}
+                try:
+                    for name in names:
+                        offset, length = chunk["columns"][name]
+                        with view[offset : offset + length] as raw:
+                            columns[name] = raw.cast(TYPECODES[self._types[name]])
+                    yield columns
+                finally:
+                    for column in columns.values():
+                        column.release()
+        finally:
+            view.release()
+
+    def column(self, name: str) -> array:
+        """Materialise one column across all chunks into a single typed array."""
+        result = array(TYPECODES[self._types[name]])
+        for chunk in self.iter_chunks([name]):
+            result.frombytes(chunk[name].tobytes())
+        return result
+
+
+__all__ = ["CHUNK_ROWS", "Column", "ColumnarFile", "ColumnarWriter"]
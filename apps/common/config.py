@@ -37,6 +37,19 @@ def _default_kill_switch() -> Path:
     return Path(_env_str("KILL_SWITCH_FILE", str(Path(tempfile.gettempdir()) / "tdi_kill_switch")))
 
 
+def _default_control_socket() -> Path:
+    return Path(_env_str("CONTROL_SOCKET", str(Path(tempfile.gettempdir()) / "tdi_control.sock")))
+
+
+def _default_settings_file() -> Path | None:
+    raw = os.getenv("SETTINGS_FILE")
+    return Path(raw) if raw else None
+
+
+def _default_kill_switch_poll() -> float:
+    return _env_float("KILL_SWITCH_POLL_SECONDS", 1.0)
+
+
 def _default_run_id() -> str:
     return _env_str("RUN_ID", datetime.now(UTC).strftime("%Y%m%d%H%M%S"))
 
@@ -73,6 +86,10 @@ def _default_candles_limit() -> int:
     return _env_int("CANDLES_LIMIT", 500)
 
 
+def _default_events_poll_interval() -> float:
+    return _env_float("EVENTS_POLL_SECONDS", 1.0)
+
+
 def _default_risk_per_trade() -> float:
     return _env_float("RISK_PER_TRADE", 0.005)
 
@@ -81,6 +98,21 @@ def _default_daily_max_dd() -> float:
     return _env_float("DAILY_MAX_DRAWDOWN", 0.02)
 
 
+def read_settings_file(path: Path) -> dict[str, str]:
+    """Parse ``NAME=value`` lines (environment variable names); blank lines and ``#`` comments
+    are skipped."""
+    settings: dict[str, str] = {}
+    for number, line in enumerate(path.read_text().splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, sep, value = line.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"{path}:{number}: expected NAME=value")
+        settings[name.strip()] = value.strip()
+    return settings
+
+
 @dataclass(slots=True)
 class BotConfig:
     symbol: str = field(default_factory=_default_symbol)
@@ -91,6 +123,9 @@ class BotConfig:
     db_url: str = field(default_factory=_default_db_url)
     dashboard_port: int = field(default_factory=_default_dashboard_port)
     kill_switch_file: Path = field(default_factory=_default_kill_switch)
+    kill_switch_poll_seconds: float = field(default_factory=_default_kill_switch_poll)
+    control_socket: Path = field(default_factory=_default_control_socket)
+    settings_file: Path | None = field(default_factory=_default_settings_file)
     poll_interval_seconds: int = field(default_factory=_default_poll_interval)
     run_id: str = field(default_factory=_default_run_id)
     price_source: str = field(default_factory=_default_price_source)
@@ -107,6 +142,7 @@ class WebConfig:
     dashboard_port: int = field(default_factory=_default_dashboard_port)
     mode: str = field(default_factory=_default_mode)
     run_id: str | None = field(default_factory=lambda: os.getenv("RUN_ID"))
+    events_poll_seconds: float = field(default_factory=_default_events_poll_interval)
 
 
-__all__ = ["BotConfig", "WebConfig", "DEFAULT_DB_URL"]
+__all__ = ["BotConfig", "WebConfig", "DEFAULT_DB_URL", "read_settings_file"]
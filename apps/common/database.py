@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import base64
+import json
 import sqlite3
-from collections.abc import Iterator
+from collections.abc import Generator, Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import date, datetime
@@ -9,6 +11,47 @@ from pathlib import Path
 
 from apps.common.config import DEFAULT_DB_URL
 
+TRADE_COLUMNS = (
+    "id",
+    "ts",
+    "side",
+    "qty",
+    "entry",
+    "exit",
+    "pnl",
+    "fees",
+    "r_multiple",
+    "reason_in",
+    "reason_out",
+    "run_id",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class TradeCursor:
+    """Keyset position in the ``(run_id, ts, id)`` ordering of ``trades``."""
+
+    run_id: str
+    ts: str
+    id: int
+
+    def encode(self) -> str:
+        raw = json.dumps([self.run_id, self.ts, self.id], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> TradeCursor:
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            run_id, ts, row_id = json.loads(raw)
+            return cls(run_id=str(run_id), ts=str(ts), id=int(row_id))
+        except (ValueError, TypeError) as exc:
+            raise ValueError(f"Invalid trade cursor: {token!r}") from exc
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> TradeCursor:
+        return cls(run_id=row["run_id"], ts=row["ts"], id=int(row["id"]))
+
 
 @dataclass(slots=True)
 class Database:
@@ -25,13 +68,28 @@ class Database:
         finally:
             conn.close()
 
+    def flush(self) -> int:
+        """Persist buffered writes; every write here is already committed, so this is a no-op."""
+        return 0
+
     def insert_equity_point(
-        self, run_id: str, ts: datetime, equity: float, drawdown: float
+        self,
+        run_id: str,
+        ts: datetime,
+        equity: float,
+        drawdown: float,
+        price: float | None = None,
     ) -> None:
         with self.connect() as conn:
             conn.execute(
-                "INSERT INTO equity_curve (ts, equity, dd, run_id) VALUES (?, ?, ?, ?)",
-                (ts.isoformat(), float(equity), float(drawdown), run_id),
+                "INSERT INTO equity_curve (ts, equity, dd, price, run_id) VALUES (?, ?, ?, ?, ?)",
+                (
+                    ts.isoformat(),
+                    float(equity),
+                    float(drawdown),
+                    None if price is None else float(price),
+                    run_id,
+                ),
             )
 
     def upsert_daily_metrics(
@@ -109,6 +167,58 @@ class Database:
                 ),
             )
 
+    def iter_trades(
+        self,
+        *,
+        run_id: str | None = None,
+        side: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        reason: str | None = None,
+        after: TradeCursor | None = None,
+        limit: int | None = None,
+    ) -> Generator[sqlite3.Row, None, None]:
+        """Yield trades in ``(run_id, ts, id)`` order, resuming strictly after ``after``.
+
+        Paging is keyset-based so it walks ``idx_trades_run_ts`` from the cursor position instead
+        of skipping rows, and rows are yielded straight from the SQLite cursor. ``since`` is
+        inclusive and ``until`` exclusive; ``reason`` matches either the entry or exit reason.
+        """
+        clauses: list[str] = []
+        params: list[object] = []
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if side is not None:
+            clauses.append("side = ?")
+            params.append(side)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until.isoformat())
+        if reason is not None:
+            clauses.append("(reason_in = ? OR reason_out = ?)")
+            params.extend((reason, reason))
+        if after is not None and after.run_id == run_id:
+            # run_id is already pinned by equality, so seek on (ts, id) within the index range.
+            clauses.append("(ts, id) > (?, ?)")
+            params.extend((after.ts, after.id))
+        elif after is not None:
+            clauses.append("(run_id, ts, id) > (?, ?, ?)")
+            params.extend((after.run_id, after.ts, after.id))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT {', '.join(TRADE_COLUMNS)} FROM trades {where} "  # noqa: S608
+            "ORDER BY run_id, ts, id"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self.connect() as conn:
+            yield from conn.execute(sql, params)
+
 
 def resolve_sqlite_path(db_url: str) -> Path:
     if db_url.startswith("sqlite:///"):
@@ -122,4 +232,10 @@ def create_database(db_url: str) -> Database:
     return Database(path=resolve_sqlite_path(db_url))
 
 
-__all__ = ["Database", "create_database", "resolve_sqlite_path"]
+__all__ = [
+    "TRADE_COLUMNS",
+    "Database",
+    "TradeCursor",
+    "create_database",
+    "resolve_sqlite_path",
+]
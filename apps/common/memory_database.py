@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from apps.common.database import TRADE_COLUMNS, Database, resolve_sqlite_path
+from apps.common.schema import apply_schema
+
+_EQUITY_COLUMNS = ("ts", "equity", "dd", "price", "run_id")
+_TRADE_COLUMNS = tuple(column for column in TRADE_COLUMNS if column != "id")
+_METRICS_COLUMNS = (
+    "date",
+    "win_rate",
+    "avg_r",
+    "expectancy",
+    "max_dd",
+    "sharpe",
+    "trades_count",
+    "run_id",
+)
+
+
+@dataclass(slots=True)
+class MemoryDatabase(Database):
+    """Database that records into an in-memory SQLite copy of the schema.
+
+    Writes and queries behave like :class:`Database`, but nothing touches ``path`` until
+    :meth:`flush` copies every buffered row into it in one transaction. Used as a context manager
+    it flushes on success and discards on error.
+    """
+
+    _conn: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.RLock = field(init=False, repr=False, default_factory=threading.RLock)
+
+    def __post_init__(self) -> None:
+        # Autocommit: there is no durability to protect in memory, so skip per-write commits and
+        # only open a transaction around the flush.
+        conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        apply_schema(conn)
+        self._conn = conn
+
+    def __enter__(self) -> MemoryDatabase:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.flush()
+            else:
+                self.discard()
+        finally:
+            self.close()
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            yield self._conn
+
+    def flush(self) -> int:
+        """Persist buffered rows into ``path`` atomically and return how many were written."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        equity = ", ".join(_EQUITY_COLUMNS)
+        trades = ", ".join(_TRADE_COLUMNS)
+        metrics = ", ".join(_METRICS_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in _METRICS_COLUMNS[1:-1])
+        with self._lock:
+            self._conn.execute("ATTACH DATABASE ? AS target", (str(self.path),))
+            try:
+                # Migrate through the attachment itself: the file may have been replaced since
+                # this process last checked it, and ATTACH creates an empty database if missing.
+                # apply_schema upgrades under the target's write lock, so concurrent flushes from
+                # other processes cannot apply a step twice.
+                apply_schema(self._conn, "target")
+                with self._transaction():
+                    written = 0
+                    written += self._conn.execute(
+                        f"INSERT INTO target.equity_curve ({equity}) "  # noqa: S608
+                        f"SELECT {equity} FROM main.equity_curve ORDER BY id"
+                    ).rowcount
+                    written += self._conn.execute(
+                        f"INSERT INTO target.trades ({trades}) "  # noqa: S608
+                        f"SELECT {trades} FROM main.trades ORDER BY id"
+                    ).rowcount
+                    written += self._conn.execute(
+                        f"INSERT INTO target.metrics_daily ({metrics}) "  # noqa: S608
+                        f"SELECT {metrics} FROM main.metrics_daily WHERE true "
+                        f"ON CONFLICT(date, run_id) DO UPDATE SET {updates}"
+                    ).rowcount
+                    self._clear()
+            finally:
+                self._conn.execute("DETACH DATABASE target")
+        return written
+
+    def discard(self) -> None:
+        with self._lock, self._transaction():
+            self._clear()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _clear(self) -> None:
+        for table in ("equity_curve", "trades", "metrics_daily"):
+            self._conn.execute(f"DELETE FROM main.{table}")  # noqa: S608
+
+
+def create_memory_database(db_url: str) -> MemoryDatabase:
+    return MemoryDatabase(path=resolve_sqlite_path(db_url))
+
+
+__all__ = ["MemoryDatabase", "create_memory_database"]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sqlite3
+
+SCHEMA_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS {schema}.trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts TEXT NOT NULL,
+        side TEXT NOT NULL,
+        qty REAL NOT NULL,
+        entry REAL NOT NULL,
+        exit REAL,
+        pnl REAL,
+        fees REAL NOT NULL DEFAULT 0,
+        r_multiple REAL,
+        reason_in TEXT NOT NULL,
+        reason_out TEXT,
+        run_id TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS {schema}.equity_curve (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts TEXT NOT NULL,
+        equity REAL NOT NULL,
+        dd REAL NOT NULL,
+        run_id TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS {schema}.metrics_daily (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        win_rate REAL NOT NULL,
+        avg_r REAL NOT NULL,
+        expectancy REAL NOT NULL,
+        max_dd REAL NOT NULL,
+        sharpe REAL NOT NULL,
+        trades_count INTEGER NOT NULL,
+        run_id TEXT NOT NULL,
+        UNIQUE(date, run_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS {schema}.idx_equity_curve_run_ts ON equity_curve(run_id, ts)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS {schema}.idx_trades_run_ts ON trades(run_id, ts)
+    """,
+)
+
+
+# Statements name their schema as ``{schema}`` so they can target an attached database.
+# Each entry upgrades the schema to its version; PRAGMA user_version records the last one applied.
+MIGRATIONS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    (1, SCHEMA_STATEMENTS),
+    (2, ("ALTER TABLE {schema}.equity_curve ADD COLUMN price REAL",)),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection, schema: str = "main") -> int:
+    return int(conn.execute(f"PRAGMA {schema}.user_version").fetchone()[0])
+
+
+def apply_schema(conn: sqlite3.Connection, schema: str = "main") -> None:
+    """Bring ``schema`` (``main`` or an attached database name) up to ``SCHEMA_VERSION``.
+
+    Safe to call from several processes at once: the version is re-read under a write lock
+    (``BEGIN IMMEDIATE``) and every pending step is applied and recorded in that transaction, so
+    exactly one caller upgrades and the others see the new version.
+    """
+    if schema_version(conn, schema) >= SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = schema_version(conn, schema)
+        for version, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in statements:
+                conn.execute(statement.format(schema=schema))
+            conn.execute(f"PRAGMA {schema}.user_version = {version}")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+__all__ = ["MIGRATIONS", "SCHEMA_STATEMENTS", "SCHEMA_VERSION", "apply_schema", "schema_version"]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Each probe runs in a fresh interpreter so module caches and the per-process migration guard do
+# not leak between samples. The probe prints the elapsed milliseconds of the measured section.
+PROBES: dict[str, str] = {
+    "import_web": (
+        "import time; t = time.perf_counter(); import apps.web.main; "
+        "print((time.perf_counter() - t) * 1000)"
+    ),
+    "import_bot_cli": (
+        "import time; t = time.perf_counter(); import apps.bot.cli; "
+        "print((time.perf_counter() - t) * 1000)"
+    ),
+    "web_first_request": (
+        "import time; t = time.perf_counter(); "
+        "from apps.web.main import create_app; app = create_app(); "
+        "app({'PATH_INFO': '/healthz'}, lambda *a: None); app.db; "
+        "print((time.perf_counter() - t) * 1000)"
+    ),
+    "migrate_warm": (
+        "import os, time; from apps.bot.migrations import run_migrations; "
+        "t = time.perf_counter(); run_migrations(os.environ['DB_URL']); "
+        "print((time.perf_counter() - t) * 1000)"
+    ),
+}
+
+
+def _run_probe(code: str, env: dict[str, str]) -> float:
+    result = subprocess.run(  # noqa: S603 - runs the current interpreter with a fixed snippet
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(repeat: int = 5) -> dict[str, dict[str, float]]:
+    root = Path(__file__).resolve().parents[2]
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DB_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(root), env.get("PYTHONPATH")]))
+        # Create the schema once so the remaining samples exercise the warm (already migrated) path.
+        _run_probe(PROBES["migrate_warm"], env)
+        results: dict[str, dict[str, float]] = {}
+        for name, code in PROBES.items():
+            samples = [_run_probe(code, env) for _ in range(repeat)]
+            results[name] = {
+                "min_ms": min(samples),
+                "median_ms": statistics.median(samples),
+                "max_ms": max(samples),
+            }
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure import and cold-start latency")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per probe")
+    args = parser.parse_args(argv)
+    print(json.dumps(measure_startup(args.repeat), indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from apps.common.database import Database
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 256
+POLL_BATCH_SIZE = 500
+HEARTBEAT_SECONDS = 15.0
+RETRY_MILLISECONDS = 2000
+
+
+def format_sse(event: str, data: dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+@dataclass(eq=False, slots=True)
+class Subscription:
+    pending: queue.Queue[bytes] = field(
+        default_factory=lambda: queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    )
+    closed: threading.Event = field(default_factory=threading.Event)
+
+
+class TickBroadcaster:
+    """Poll the database once per interval and fan new ticks and trades out to subscribers.
+
+    A single producer thread runs while at least one subscriber is connected, so the polling cost
+    is independent of how many dashboards are open. Publishing never blocks: a subscriber whose
+    queue is full is closed, and the browser's ``EventSource`` reconnects with a fresh snapshot.
+    """
+
+    def __init__(
+        self,
+        db_provider: Callable[[], Database],
+        *,
+        interval: float = 1.0,
+        run_id: str | None = None,
+    ) -> None:
+        self._db_provider = db_provider
+        self.interval = interval
+        self.run_id = run_id
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._last_equity_id = 0
+        self._last_trade_id = 0
+        self._snapshot: bytes | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription()
+        with self._lock:
+            if self._thread is None:
+                self._prime()
+                self._thread = threading.Thread(
+                    target=self._run, name="tick-broadcaster", daemon=True
+                )
+                self._thread.start()
+            self._subscribers.add(subscription)
+            if self._snapshot is not None:
+                subscription.pending.put_nowait(self._snapshot)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.closed.set()
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stream(self, subscription: Subscription) -> Iterator[bytes]:
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+            while not subscription.closed.is_set():
+                try:
+                    message = subscription.pending.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield b": keepalive\n\n"
+                    continue
+                yield message
+        finally:
+            self.unsubscribe(subscription)
+
+    def poll_once(self) -> int:
+        """Publish rows written since the previous poll and return how many were sent."""
+        messages = self._collect()
+        if messages:
+            self._publish(messages)
+        return len(messages)
+
+    def _prime(self) -> None:
+        # Start from the current end of both tables so subscribers only receive new rows.
+        run_filter, params = self._run_filter()
+        with self._db_provider().connect() as conn:
+            row = conn.execute(
+                "SELECT id, ts, equity, dd, price, run_id FROM equity_curve "  # noqa: S608
+                f"{run_filter} ORDER BY id DESC LIMIT 1",
+                params,
+            ).fetchone()
+            if row is not None:
+                self._last_equity_id = int(row["id"])
+                self._snapshot = format_sse("tick", _tick_payload(row))
+            row = conn.execute("SELECT MAX(id) AS max_id FROM trades").fetchone()
+            self._last_trade_id = int(row["max_id"] or 0)
+
+    def _run_filter(self) -> tuple[str, tuple[str, ...]]:
+        if self.run_id is None:
+            return "", ()
+        return "WHERE run_id = ?", (self.run_id,)
+
+    def _collect(self) -> list[bytes]:
+        run_clause = "" if self.run_id is None else " AND run_id = ?"
+        run_params: tuple[str, ...] = () if self.run_id is None else (self.run_id,)
+        messages: list[bytes] = []
+        with self._db_provider().connect() as conn:
+            ticks = conn.execute(
+                "SELECT id, ts, equity, dd, price, run_id FROM equity_curve "  # noqa: S608
+                f"WHERE id > ?{run_clause} ORDER BY id LIMIT ?",
+                (self._last_equity_id, *run_params, POLL_BATCH_SIZE),
+            ).fetchall()
+            trades = conn.execute(
+                "SELECT id, ts, side, qty, entry, exit, pnl, reason_in, reason_out, "  # noqa: S608
+                f"run_id FROM trades WHERE id > ?{run_clause} ORDER BY id LIMIT ?",
+                (self._last_trade_id, *run_params, POLL_BATCH_SIZE),
+            ).fetchall()
+        for row in ticks:
+            messages.append(format_sse("tick", _tick_payload(row)))
+            self._last_equity_id = int(row["id"])
+        if ticks:
+            self._snapshot = messages[-1]
+        for row in trades:
+            messages.append(format_sse("trade", dict(row)))
+            self._last_trade_id = int(row["id"])
+        return messages
+
+    def _publish(self, messages: list[bytes]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                for message in messages:
+                    subscription.pending.put_nowait(message)
+            except queue.Full:
+                logger.warning("sse_subscriber_lagging")
+                self.unsubscribe(subscription)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("sse_poll_failed")
+
+
+def _tick_payload(row: Any) -> dict[str, Any]:
+    return {
+        "id": row["id"],
+        "ts": row["ts"],
+        "equity": row["equity"],
+        "drawdown": row["dd"],
+        "price": row["price"],
+        "run_id": row["run_id"],
+    }
+
+
+__all__ = ["Subscription", "TickBroadcaster", "format_sse"]
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
+from collections.abc import Iterator
 from dataclasses import dataclass
-from datetime import datetime
-from wsgiref.simple_server import make_server
+from datetime import UTC, datetime
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIServer, make_server
 
-from apps.bot.migrations import run_migrations
+from apps.bot.migrations import ensure_migrated
 from apps.common.config import WebConfig
-from apps.common.database import create_database
+from apps.common.database import TRADE_COLUMNS, Database, TradeCursor, create_database
+from apps.web.events import TickBroadcaster
 
-config = WebConfig()
-db = create_database(config.db_url)
-run_migrations(config.db_url)
+TRADES_PAGE_DEFAULT = 100
+TRADES_PAGE_MAX = 1000
 
 
 @dataclass(slots=True)
@@ -22,14 +27,24 @@ class DashboardSummary:
     last_ts: datetime | None = None
 
 
-def _fetch_summary() -> DashboardSummary:
+def _fetch_summary(db: Database, run_id: str | None = None) -> DashboardSummary:
+    # Scope to the same run as the /events stream so live updates continue these values.
+    run_filter = "" if run_id is None else "WHERE run_id = ?"
+    params: tuple[str, ...] = () if run_id is None else (run_id,)
     summary = DashboardSummary()
     with db.connect() as conn:
-        cursor = conn.execute("SELECT COUNT(*) AS c FROM trades")
+        cursor = conn.execute(
+            f"SELECT COUNT(*) AS c FROM trades {run_filter}",  # noqa: S608
+            params,
+        )
         row = cursor.fetchone()
         if row:
             summary.trades_count = int(row["c"])
-        cursor = conn.execute("SELECT ts, equity, dd FROM equity_curve ORDER BY ts DESC LIMIT 1")
+        cursor = conn.execute(
+            f"SELECT ts, equity, dd FROM equity_curve {run_filter} "  # noqa: S608
+            "ORDER BY ts DESC LIMIT 1",
+            params,
+        )
         row = cursor.fetchone()
         if row:
             summary.latest_equity = float(row["equity"])
@@ -38,7 +53,7 @@ def _fetch_summary() -> DashboardSummary:
     return summary
 
 
-def _render_dashboard(summary: DashboardSummary) -> str:
+def _render_dashboard(summary: DashboardSummary, run_id: str | None) -> str:
     ts_text = summary.last_ts.strftime("%Y-%m-%d %H:%M:%S") if summary.last_ts else "—"
     return f"""
     <html>
@@ -84,56 +99,256 @@ def _render_dashboard(summary: DashboardSummary) -> str:
             <div class="metrics">
                 <div class="card">
                     <span class="label">Run ID</span>
-                    <span class="value">{config.run_id or "—"}</span>
+                    <span class="value">{run_id or "—"}</span>
                 </div>
                 <div class="card">
                     <span class="label">Trades</span>
-                    <span class="value">{summary.trades_count}</span>
+                    <span class="value" id="trades">{summary.trades_count}</span>
                 </div>
                 <div class="card">
                     <span class="label">Latest Equity</span>
-                    <span class="value">{summary.latest_equity:,.2f}</span>
+                    <span class="value" id="equity">{summary.latest_equity:,.2f}</span>
                 </div>
                 <div class="card">
                     <span class="label">Drawdown</span>
-                    <span class="value">{summary.latest_drawdown:,.4f}</span>
+                    <span class="value" id="drawdown">{summary.latest_drawdown:,.4f}</span>
                 </div>
                 <div class="card">
                     <span class="label">Last Tick</span>
-                    <span class="value">{ts_text}</span>
+                    <span class="value" id="last-tick">{ts_text}</span>
+                </div>
+                <div class="card">
+                    <span class="label">Price</span>
+                    <span class="value" id="price">—</span>
                 </div>
             </div>
+            <script>
+                const source = new EventSource("/events");
+                const setText = (id, text) => {{ document.getElementById(id).textContent = text; }};
+                const fmt = (value, digits) => value.toLocaleString(undefined, {{
+                    minimumFractionDigits: digits,
+                    maximumFractionDigits: digits,
+                }});
+                source.addEventListener("tick", (event) => {{
+                    const tick = JSON.parse(event.data);
+                    setText("equity", fmt(tick.equity, 2));
+                    setText("drawdown", fmt(tick.drawdown, 4));
+                    setText("last-tick", tick.ts.slice(0, 19).replace("T", " "));
+                    if (tick.price !== null) {{
+                        setText("price", fmt(tick.price, 2));
+                    }}
+                }});
+                source.addEventListener("trade", () => {{
+                    const node = document.getElementById("trades");
+                    node.textContent = Number(node.textContent) + 1;
+                }});
+            </script>
         </body>
     </html>
     """
 
 
+@dataclass(slots=True)
+class TradesQuery:
+    run_id: str | None = None
+    side: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    reason: str | None = None
+    after: TradeCursor | None = None
+    limit: int = TRADES_PAGE_DEFAULT
+
+
+def _parse_timestamp(name: str, raw: str) -> datetime:
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an ISO-8601 timestamp") from exc
+    # Stored timestamps are UTC isoformat strings, so compare against the same representation.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _parse_trades_query(query_string: str) -> TradesQuery:
+    params = {key: values[-1] for key, values in parse_qs(query_string).items()}
+    query = TradesQuery(
+        run_id=params.get("run_id"),
+        side=params.get("side"),
+        reason=params.get("reason"),
+    )
+    if "since" in params:
+        query.since = _parse_timestamp("since", params["since"])
+    if "until" in params:
+        query.until = _parse_timestamp("until", params["until"])
+    if "cursor" in params:
+        query.after = TradeCursor.decode(params["cursor"])
+    if "limit" in params:
+        try:
+            query.limit = int(params["limit"])
+        except ValueError as exc:
+            raise ValueError("limit must be an integer") from exc
+        if not 1 <= query.limit <= TRADES_PAGE_MAX:
+            raise ValueError(f"limit must be between 1 and {TRADES_PAGE_MAX}")
+    return query
+
+
+def _stream_trades(db: Database, query: TradesQuery) -> Iterator[bytes]:
+    # Ask for one extra row: if it arrives there is a next page, and the cursor points at the
+    # last row emitted rather than the probe row.
+    rows = db.iter_trades(
+        run_id=query.run_id,
+        side=query.side,
+        since=query.since,
+        until=query.until,
+        reason=query.reason,
+        after=query.after,
+        limit=query.limit + 1,
+    )
+    emitted = 0
+    last_row: sqlite3.Row | None = None
+    next_cursor = None
+    try:
+        yield b'{"trades":['
+        for row in rows:
+            if emitted == query.limit:
+                assert last_row is not None
+                next_cursor = TradeCursor.from_row(last_row).encode()
+                break
+            prefix = b"," if emitted else b""
+            yield prefix + json.dumps({column: row[column] for column in TRADE_COLUMNS}).encode()
+            emitted += 1
+            last_row = row
+    finally:
+        rows.close()
+    yield b'],"next_cursor":' + json.dumps(next_cursor).encode() + b"}"
+
+
+class DashboardApp:
+    """WSGI dashboard whose configuration and database are resolved on first use."""
+
+    def __init__(self, config: WebConfig | None = None) -> None:
+        self._config = config
+        self._db: Database | None = None
+        self._broadcaster: TickBroadcaster | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> WebConfig:
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = WebConfig()
+        return self._config
+
+    @property
+    def db(self) -> Database:
+        if self._db is None:
+            config = self.config
+            with self._lock:
+                if self._db is None:
+                    ensure_migrated(config.db_url)
+                    self._db = create_database(config.db_url)
+        return self._db
+
+    @property
+    def broadcaster(self) -> TickBroadcaster:
+        if self._broadcaster is None:
+            config = self.config
+            with self._lock:
+                if self._broadcaster is None:
+                    self._broadcaster = TickBroadcaster(
+                        lambda: self.db,
+                        interval=config.events_poll_seconds,
+                        run_id=config.run_id,
+                    )
+        return self._broadcaster
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "/")
+        if path == "/healthz":
+            payload = json.dumps({"status": "ok", "mode": self.config.mode}).encode()
+            start_response(
+                "200 OK",
+                [("Content-Type", "application/json"), ("Content-Length", str(len(payload)))],
+            )
+            return [payload]
+
+        if path == "/":
+            summary = _fetch_summary(self.db, self.config.run_id)
+            body = _render_dashboard(summary, self.config.run_id).encode()
+            start_response(
+                "200 OK",
+                [("Content-Type", "text/html; charset=utf-8"), ("Content-Length", str(len(body)))],
+            )
+            return [body]
+
+        if path == "/api/trades":
+            try:
+                query = _parse_trades_query(environ.get("QUERY_STRING", ""))
+            except ValueError as exc:
+                payload = json.dumps({"error": str(exc)}).encode()
+                start_response(
+                    "400 Bad Request",
+                    [("Content-Type", "application/json"), ("Content-Length", str(len(payload)))],
+                )
+                return [payload]
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return _stream_trades(self.db, query)
+
+        if path == "/events":
+            broadcaster = self.broadcaster
+            subscription = broadcaster.subscribe()
+            start_response(
+                "200 OK",
+                [
+                    ("Content-Type", "text/event-stream"),
+                    ("Cache-Control", "no-cache"),
+                    ("X-Accel-Buffering", "no"),
+                ],
+            )
+            return broadcaster.stream(subscription)
+
+        start_response("404 Not Found", [("Content-Type", "text/plain"), ("Content-Length", "0")])
+        return [b""]
+
+
+def create_app(config: WebConfig | None = None) -> DashboardApp:
+    return DashboardApp(config)
+
+
+_default_app: DashboardApp | None = None
+
+
+def get_app() -> DashboardApp:
+    global _default_app
+    if _default_app is None:
+        _default_app = create_app()
+    return _default_app
+
+
 def application(environ, start_response):
-    path = environ.get("PATH_INFO", "/")
-    if path == "/healthz":
-        payload = json.dumps({"status": "ok", "mode": config.mode}).encode()
-        start_response(
-            "200 OK", [("Content-Type", "application/json"), ("Content-Length", str(len(payload)))]
-        )
-        return [payload]
-
-    if path == "/":
-        summary = _fetch_summary()
-        body = _render_dashboard(summary).encode()
-        start_response(
-            "200 OK",
-            [("Content-Type", "text/html; charset=utf-8"), ("Content-Length", str(len(body)))],
-        )
-        return [body]
+    return get_app()(environ, start_response)
+
 
-    start_response("404 Not Found", [("Content-Type", "text/plain"), ("Content-Length", "0")])
-    return [b""]
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    # Each /events stream holds its connection open, so requests need their own threads.
+    daemon_threads = True
 
 
-def serve(port: int) -> None:
-    with make_server("0.0.0.0", port, application) as httpd:  # noqa: S104 - required for local development
+def serve(port: int | None = None, app: DashboardApp | None = None) -> None:
+    app = app or get_app()
+    port = app.config.dashboard_port if port is None else port
+    # Migrate before accepting connections so the first request does not pay for it.
+    app.db  # noqa: B018
+    with make_server(
+        "0.0.0.0",  # noqa: S104 - required for local development
+        port,
+        app,
+        server_class=_ThreadingWSGIServer,
+    ) as httpd:
         httpd.serve_forever()
 
 
 if __name__ == "__main__":
-    serve(config.dashboard_port)
+    serve()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import math
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from apps.bot.analytics import compare_runs, export_runs
+from apps.bot.migrations import run_migrations
+from apps.common import columnar
+from apps.common.columnar import Column, ColumnarFile, ColumnarWriter
+from apps.common.database import create_database
+
+BASE_TS = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def test_round_trip_across_chunks(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(columnar, "CHUNK_ROWS", 3)
+    path = tmp_path / "table.col"
+    columns = (Column("run_id", "str"), Column("value", "f8"), Column("count", "i8"))
+    rows = [("a", 1.5, 1), ("a", None, 2), ("b", 3.0, 3), (None, 4.0, 4), ("b", 5.0, 5)]
+    with ColumnarWriter(path, "sample", columns) as writer:
+        writer.extend(rows)
+
+    with ColumnarFile(path) as export:
+        assert export.table == "sample"
+        assert export.num_rows == 5
+        assert len(list(export.iter_chunks(["count"]))) == 2
+        assert export.dictionaries["run_id"] == ["a", "b"]
+        assert list(export.column("run_id")) == [0, 0, 1, -1, 1]
+        assert list(export.column("count")) == [1, 2, 3, 4, 5]
+        values = export.column("value")
+        assert math.isnan(values[1])
+        assert [values[i] for i in (0, 2, 3, 4)] == [1.5, 3.0, 4.0, 5.0]
+
+
+def test_rejects_foreign_files(tmp_path) -> None:
+    path = tmp_path / "bogus.col"
+    path.write_bytes(b"not columnar data at all")
+    with pytest.raises(ValueError):
+        ColumnarFile(path)
+
+
+def test_stopping_iteration_early_releases_the_map(tmp_path) -> None:
+    path = tmp_path / "table.col"
+    with ColumnarWriter(path, "sample", (Column("value", "f8"),)) as writer:
+        writer.extend([(1.0,), (2.0,)])
+
+    with pytest.raises(KeyError), ColumnarFile(path) as export:
+        for _chunk in export.iter_chunks():
+            raise KeyError("consumer failed")
+    with ColumnarFile(path) as export:
+        for chunk in export.iter_chunks():
+            assert list(chunk["value"]) == [1.0, 2.0]
+            break
+
+
+def test_export_and_compare_runs(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'runs.db'}"
+    run_migrations(url)
+    db = create_database(url)
+    curves = {"up": [100.0, 110.0, 121.0], "down": [100.0, 90.0, 99.0], "skip": [1.0]}
+    for run_id, equities in curves.items():
+        for i, equity in enumerate(equities):
+            db.insert_equity_point(run_id, BASE_TS + timedelta(minutes=i), equity, 0.0)
+    for pnl, r_multiple in ((10.0, 1.0), (-5.0, -0.5), (None, None)):
+        db.insert_trade(
+            run_id="up",
+            ts=BASE_TS,
+            side="buy",
+            qty=1.0,
+            entry=100.0,
+            exit=None,
+            pnl=pnl,
+            fees=0.5,
+            r_multiple=r_multiple,
+            reason_in="tdi_cross",
+            reason_out=None,
+        )
+
+    paths = export_runs(db, tmp_path / "export", ["up", "down"])
+    assert set(paths) == {"equity_curve", "trades", "metrics_daily"}
+
+    stats = {item.run_id: item for item in compare_runs(tmp_path / "export")}
+    assert set(stats) == {"up", "down"}
+    up, down = stats["up"], stats["down"]
+    assert up.total_return == pytest.approx(0.21)
+    assert up.max_drawdown == 0.0
+    assert up.sharpe == 0.0  # constant 10% returns have no variance
+    assert (up.trades, up.wins, up.losses) == (3, 1, 1)
+    assert up.win_rate == pytest.approx(0.5)
+    assert up.expectancy == pytest.approx(2.5)
+    assert up.avg_r == pytest.approx(0.25)
+    assert up.fees == pytest.approx(1.5)
+    assert down.total_return == pytest.approx(-0.01)
+    assert down.max_drawdown == pytest.approx(0.1)
+    assert down.trades == 0
+
+
+def test_constant_return_curve_has_zero_sharpe(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'steady.db'}"
+    run_migrations(url)
+    db = create_database(url)
+    rows = [
+        ((BASE_TS + timedelta(minutes=i)).isoformat(), 100.0 * 1.01**i, 0.0, None, "steady")
+        for i in range(1_000)
+    ]
+    with db.connect() as conn:
+        conn.executemany(
+            "INSERT INTO equity_curve (ts, equity, dd, price, run_id) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+    export_runs(db, tmp_path / "export")
+    (stats,) = compare_runs(tmp_path / "export")
+    assert stats.sharpe == 0.0
+    assert stats.total_return == pytest.approx(1.01**999 - 1)
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import time
+
+import pytest
+from apps.bot import cli, control
+from apps.bot import loop as loop_module
+from apps.bot.control import (
+    ControlServer,
+    install_signal_handlers,
+    parse_command,
+    send_control_command,
+)
+from apps.bot.loop import PaperBot
+from apps.bot.migrations import run_migrations
+from apps.common.config import BotConfig
+from apps.common.database import create_database
+
+STOP_LATENCY_BUDGET_SECONDS = 0.5
+
+
+async def _fixed_price(symbol: str) -> float:
+    return 100.0
+
+
+def _bot(tmp_path) -> PaperBot:
+    config = BotConfig(
+        mode="paper",
+        db_url=f"sqlite:///{tmp_path / 'control.db'}",
+        kill_switch_file=tmp_path / "kill",
+        poll_interval_seconds=60,
+        kill_switch_poll_seconds=0.05,
+        run_id="ctl",
+    )
+    run_migrations(config.db_url)
+    return PaperBot(config, create_database(config.db_url), price_feed=_fixed_price)
+
+
+async def _wait_for_tick(bot: PaperBot) -> None:
+    # Call before the loop's first tick; wraps the feed so the test wakes once a tick is recorded.
+    ticked = asyncio.Event()
+    feed = bot.price_feed
+
+    async def signalling_feed(symbol: str) -> float:
+        price = await feed(symbol)
+        ticked.set()
+        return price
+
+    bot.price_feed = signalling_feed
+    await ticked.wait()
+
+
+def test_socket_stop_interrupts_poll_sleep(tmp_path, caplog) -> None:
+    caplog.set_level(logging.INFO)
+    bot = _bot(tmp_path)
+    socket_path = tmp_path / "ctl.sock"
+
+    async def scenario() -> tuple[dict, float]:
+        task = asyncio.create_task(bot.run(control_socket=socket_path))
+        await _wait_for_tick(bot)
+        started = time.perf_counter()
+        reply = await asyncio.to_thread(send_control_command, socket_path, "stop")
+        await task
+        return reply, time.perf_counter() - started
+
+    reply, latency = asyncio.run(scenario())
+    assert reply["ok"] and reply["stopping"]
+    assert latency < STOP_LATENCY_BUDGET_SECONDS
+    assert bot.tick == 1
+    assert not socket_path.exists()
+
+
+def test_kill_switch_file_stops_without_waiting_for_poll(tmp_path) -> None:
+    bot = _bot(tmp_path)
+
+    async def scenario() -> float:
+        task = asyncio.create_task(bot.run())
+        await _wait_for_tick(bot)
+        started = time.perf_counter()
+        bot.config.kill_switch_file.touch()
+        await task
+        return time.perf_counter() - started
+
+    assert asyncio.run(scenario()) < STOP_LATENCY_BUDGET_SECONDS
+    assert bot.tick == 1
+
+
+def test_existing_kill_switch_prevents_first_tick(tmp_path) -> None:
+    bot = _bot(tmp_path)
+    bot.config.kill_switch_file.touch()
+    asyncio.run(bot.run())
+    assert bot.tick == 0
+
+
+def test_sigterm_requests_graceful_stop(tmp_path, monkeypatch) -> None:
+    bot = _bot(tmp_path)
+    installed: list[signal.Signals] = []
+
+    def recording_install(loop, handler):
+        installed.extend(install_signal_handlers(loop, handler))
+        return installed
+
+    monkeypatch.setattr(loop_module, "install_signal_handlers", recording_install)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(bot.run(handle_signals=True))
+        await _wait_for_tick(bot)
+        # Without the loop's handler a real SIGTERM would kill the test runner.
+        assert signal.SIGTERM in installed
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.wait_for(task, STOP_LATENCY_BUDGET_SECONDS)
+
+    asyncio.run(scenario())
+    assert bot.status()["stopping"]
+
+
+def test_pause_resume_and_reload(tmp_path) -> None:
+    bot = _bot(tmp_path)
+
+    async def scenario() -> None:
+        bot.handle_command("pause", [])
+        task = asyncio.create_task(bot.run(max_ticks=1))
+        await asyncio.sleep(0.1)
+        assert bot.tick == 0
+        bot.handle_command("resume", [])
+        await asyncio.wait_for(task, STOP_LATENCY_BUDGET_SECONDS)
+
+    asyncio.run(scenario())
+    assert bot.tick == 1
+
+    reply = bot.handle_command("reload", ["poll_interval_seconds=5", "risk_per_trade=0.01"])
+    assert reply["poll_interval_seconds"] == 5
+    assert bot.config.risk_per_trade == 0.01
+    assert bot.config.run_id == "ctl"
+    with pytest.raises(ValueError):
+        bot.handle_command("reload", ["symbol=ETHUSDT"])
+    assert bot.handle_command("flush", [])["flushed"] == 0
+
+
+def test_reload_only_changes_requested_fields(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("CANDLES_LIMIT", "500")
+    bot = _bot(tmp_path)
+    bot.config.candles_limit = 42
+    assert bot.handle_command("reload", [])["reloaded"] == []
+    assert bot.handle_command("reload", ["risk_per_trade=0.01"])["reloaded"] == ["risk_per_trade"]
+    assert (bot.config.candles_limit, bot.config.poll_interval_seconds) == (42, 60)
+
+    settings = tmp_path / "bot.env"
+    settings.write_text("# tuned\nPOLL_INTERVAL_SECONDS=30\nDB_URL=sqlite:///elsewhere.db\n")
+    bot.config.settings_file = settings
+    assert bot.handle_command("reload", [])["reloaded"] == ["poll_interval_seconds"]
+    assert bot.config.poll_interval_seconds == 30
+    assert (bot.config.candles_limit, bot.config.risk_per_trade) == (42, 0.01)
+    assert bot.config.db_url.endswith("control.db")
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        "poll_interval_seconds=-5",
+        "poll_interval_seconds=0",
+        "kill_switch_poll_seconds=0",
+        "kill_switch_poll_seconds=nan",
+        "risk_per_trade=1.5",
+        "daily_max_drawdown=-0.1",
+        "candles_limit=0",
+        "candles_limit=5000",
+    ],
+)
+def test_reload_rejects_out_of_range_values(tmp_path, override) -> None:
+    bot = _bot(tmp_path)
+    before = bot.status()
+    with pytest.raises(ValueError):
+        bot.handle_command("reload", ["risk_per_trade=0.01", override])
+    assert bot.status() == before
+    assert bot.config.risk_per_trade != 0.01
+
+
+def test_reload_wakes_sleeping_loop(tmp_path) -> None:
+    bot = _bot(tmp_path)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(bot.run(max_ticks=2))
+        await _wait_for_tick(bot)
+        bot.handle_command("flush", [])
+        await asyncio.sleep(0.05)
+        assert bot.tick == 1
+        # The new interval applies to the wait already in progress (60s before the reload).
+        bot.handle_command("reload", ["poll_interval_seconds=1"])
+        await asyncio.wait_for(task, 1 + STOP_LATENCY_BUDGET_SECONDS)
+
+    asyncio.run(scenario())
+    assert bot.tick == 2
+
+
+def test_idle_client_does_not_block_stop(tmp_path, caplog) -> None:
+    bot = _bot(tmp_path)
+    socket_path = tmp_path / "ctl.sock"
+
+    async def scenario() -> float:
+        task = asyncio.create_task(bot.run(control_socket=socket_path))
+        await _wait_for_tick(bot)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+            idle.connect(str(socket_path))
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            bot.config.kill_switch_file.touch()
+            await asyncio.wait_for(task, STOP_LATENCY_BUDGET_SECONDS)
+            return time.perf_counter() - started
+
+    assert asyncio.run(scenario()) < STOP_LATENCY_BUDGET_SECONDS
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+
+
+def test_silent_client_is_dropped_after_read_timeout(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(control, "CLIENT_READ_TIMEOUT_SECONDS", 0.05)
+    socket_path = tmp_path / "ctl.sock"
+
+    async def scenario() -> bytes:
+        server = ControlServer(socket_path, lambda command, args: {})
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+            received = await asyncio.wait_for(reader.read(), 1.0)
+            writer.close()
+            return received
+        finally:
+            await server.close()
+
+    assert asyncio.run(scenario()) == b""
+
+
+def test_control_socket_refuses_live_path_and_replaces_stale(tmp_path) -> None:
+    socket_path = tmp_path / "ctl.sock"
+
+    async def scenario() -> None:
+        first = ControlServer(socket_path, lambda command, args: {})
+        await first.start()
+        assert socket_path.stat().st_mode & 0o777 == 0o600
+        second = ControlServer(socket_path, lambda command, args: {})
+        with pytest.raises(RuntimeError):
+            await second.start()
+        await second.close()
+        assert socket_path.exists()
+        await first.close()
+        assert not socket_path.exists()
+
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(socket_path))
+        stale.close()
+        replacement = ControlServer(socket_path, lambda command, args: {"pong": True})
+        await replacement.start()
+        reply = await asyncio.to_thread(send_control_command, socket_path, "status")
+        assert reply == {"ok": True, "pong": True}
+        await replacement.close()
+
+    asyncio.run(scenario())
+
+
+def test_ctl_reports_missing_bot_as_json(tmp_path, monkeypatch, capsys) -> None:
+    monkeypatch.setenv("CONTROL_SOCKET", str(tmp_path / "absent.sock"))
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["ctl", "status"])
+    assert exit_info.value.code == 1
+    reply = json.loads(capsys.readouterr().out)
+    assert reply["ok"] is False
+    assert "FileNotFoundError" in reply["error"]
+
+
+def test_parse_command_rejects_unknown() -> None:
+    assert parse_command("RELOAD poll_interval_seconds=5\n") == (
+        "reload",
+        ["poll_interval_seconds=5"],
+    )
+    with pytest.raises(ValueError):
+        parse_command("shutdown")
+    with pytest.raises(ValueError):
+        parse_command("   ")
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+
+from apps.bot.migrations import run_migrations
+from apps.common.database import create_database
+from apps.web import events
+from apps.web.events import TickBroadcaster
+from apps.web.main import _fetch_summary
+
+
+def _database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'events.db'}"
+    run_migrations(url)
+    return create_database(url)
+
+
+def _decode(message: bytes) -> tuple[str, dict]:
+    event_line, data_line = message.decode().strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+def test_single_poll_fans_out_to_all_subscribers(tmp_path) -> None:
+    db = _database(tmp_path)
+    polls: list[int] = []
+
+    def provider():
+        polls.append(1)
+        return db
+
+    broadcaster = TickBroadcaster(provider, interval=60)
+    subscriptions = [broadcaster.subscribe() for _ in range(100)]
+    polls.clear()
+
+    db.insert_equity_point("run", datetime.now(UTC), 100_500.0, -0.01, price=42_000.0)
+    assert broadcaster.poll_once() == 1
+    assert len(polls) == 1
+
+    for subscription in subscriptions:
+        event, payload = _decode(subscription.pending.get_nowait())
+        assert event == "tick"
+        assert payload["equity"] == 100_500.0
+        assert payload["price"] == 42_000.0
+        broadcaster.unsubscribe(subscription)
+    assert broadcaster.subscriber_count == 0
+
+
+def test_new_subscriber_receives_latest_snapshot(tmp_path) -> None:
+    db = _database(tmp_path)
+    db.insert_equity_point("run", datetime.now(UTC), 99_000.0, -0.02, price=41_000.0)
+    broadcaster = TickBroadcaster(lambda: db, interval=60)
+    subscription = broadcaster.subscribe()
+    event, payload = _decode(subscription.pending.get_nowait())
+    assert event == "tick"
+    assert payload["drawdown"] == -0.02
+    assert broadcaster.poll_once() == 0
+
+
+def test_lagging_subscriber_is_closed_without_blocking(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(events, "SUBSCRIBER_QUEUE_SIZE", 2)
+    db = _database(tmp_path)
+    broadcaster = TickBroadcaster(lambda: db, interval=60)
+    slow = broadcaster.subscribe()
+    for _ in range(3):
+        db.insert_equity_point("run", datetime.now(UTC), 100_000.0, 0.0)
+    broadcaster.poll_once()
+    assert slow.closed.is_set()
+    assert broadcaster.subscriber_count == 0
+    assert list(broadcaster.stream(slow)) == [b"retry: 2000\n\n"]
+
+
+def test_dashboard_summary_matches_stream_run_filter(tmp_path) -> None:
+    db = _database(tmp_path)
+    for run_id in ("mine", "other", "other"):
+        db.insert_trade(
+            run_id=run_id,
+            ts=datetime.now(UTC),
+            side="buy",
+            qty=1.0,
+            entry=100.0,
+            exit=None,
+            pnl=None,
+            fees=0.0,
+            r_multiple=None,
+            reason_in="tdi_cross",
+            reason_out=None,
+        )
+    db.insert_equity_point("mine", datetime.now(UTC), 101.0, 0.0)
+    db.insert_equity_point("other", datetime.now(UTC), 202.0, 0.0)
+
+    summary = _fetch_summary(db, "mine")
+    assert summary.trades_count == 1
+    assert summary.latest_equity == 101.0
+    assert _fetch_summary(db).trades_count == 3
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import sqlite3
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from apps.bot.loop import PaperBot
+from apps.common.config import BotConfig
+from apps.common.memory_database import MemoryDatabase, create_memory_database
+
+BASE_TS = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _count(path, table: str) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: S608
+    finally:
+        conn.close()
+
+
+def _record_and_flush(barrier, url: str) -> None:
+    db = create_memory_database(url)
+    _record(db, 10)
+    barrier.wait()
+    db.flush()
+    db.close()
+
+
+def _record(db: MemoryDatabase, ticks: int) -> None:
+    for i in range(ticks):
+        db.insert_equity_point("replay", BASE_TS + timedelta(seconds=i), 100_000.0 + i, 0.0)
+    db.insert_trade(
+        run_id="replay",
+        ts=BASE_TS,
+        side="buy",
+        qty=1.0,
+        entry=100.0,
+        exit=101.0,
+        pnl=1.0,
+        fees=0.1,
+        r_multiple=1.0,
+        reason_in="tdi_cross",
+        reason_out="target",
+    )
+    db.upsert_daily_metrics(
+        "replay",
+        date(2025, 1, 1),
+        win_rate=1.0,
+        avg_r=1.0,
+        expectancy=1.0,
+        max_dd=0.0,
+        sharpe=0.0,
+        trades_count=1,
+    )
+
+
+def test_buffers_in_memory_until_flush(tmp_path) -> None:
+    target = tmp_path / "target.db"
+    db = create_memory_database(f"sqlite:///{target}")
+    _record(db, 1_000)
+    assert not target.exists()
+    assert [row["reason_out"] for row in db.iter_trades(run_id="replay")] == ["target"]
+
+    assert db.flush() == 1_002
+    assert _count(target, "equity_curve") == 1_000
+    assert _count(target, "trades") == 1
+    assert _count(target, "metrics_daily") == 1
+    assert db.flush() == 0
+
+    _record(db, 10)
+    db.flush()
+    assert _count(target, "equity_curve") == 1_010
+    assert _count(target, "metrics_daily") == 1
+    db.close()
+
+
+def test_context_manager_discards_on_error(tmp_path) -> None:
+    target = tmp_path / "target.db"
+    with pytest.raises(RuntimeError), MemoryDatabase(path=target) as db:
+        _record(db, 5)
+        raise RuntimeError("backtest failed")
+    assert not target.exists()
+
+    with MemoryDatabase(path=target) as db:
+        _record(db, 5)
+    assert _count(target, "equity_curve") == 5
+
+
+def test_paper_bot_records_into_memory(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("MODE", "paper")
+    target = tmp_path / "bot.db"
+    config = BotConfig(db_url=f"sqlite:///{target}", run_id="mem")
+    with create_memory_database(config.db_url) as db:
+        bot = PaperBot(config=config, database=db)
+        for tick in range(1, 4):
+            asyncio.run(bot._on_tick(price=100.0, tick=tick))
+        assert not target.exists()
+    assert _count(target, "equity_curve") == 3
+
+
+def test_flush_migrates_recreated_target(tmp_path) -> None:
+    target = tmp_path / "target.db"
+    db = create_memory_database(f"sqlite:///{target}")
+    _record(db, 3)
+    db.flush()
+    target.unlink()
+    _record(db, 2)
+    assert db.flush() == 4
+    assert _count(target, "equity_curve") == 2
+    db.close()
+
+
+def test_concurrent_flushes_migrate_fresh_target_once(tmp_path) -> None:
+    target = tmp_path / "shared.db"
+    context = multiprocessing.get_context()
+    barrier = context.Barrier(4)
+    processes = [
+        context.Process(target=_record_and_flush, args=(barrier, f"sqlite:///{target}"))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert _count(target, "equity_curve") == 40
+    assert _count(target, "metrics_daily") == 1
@@ -1,8 +1,40 @@
 from __future__ import annotations
 
+import multiprocessing
 import sqlite3
 
-from apps.bot.migrations import run_migrations
+from apps.bot import migrations
+from apps.bot.migrations import (
+    SCHEMA_STATEMENTS,
+    SCHEMA_VERSION,
+    run_migrations,
+    schema_version,
+)
+
+CONCURRENT_MIGRATORS = 4
+
+
+def _migrate_after(barrier, url: str) -> None:
+    barrier.wait()
+    run_migrations(url)
+
+
+def _ensure_after(barrier, url: str) -> None:
+    barrier.wait()
+    migrations.ensure_migrated(url)
+
+
+def _run_concurrently(target, url: str) -> list[int | None]:
+    context = multiprocessing.get_context()
+    barrier = context.Barrier(CONCURRENT_MIGRATORS)
+    processes = [
+        context.Process(target=target, args=(barrier, url)) for _ in range(CONCURRENT_MIGRATORS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+    return [process.exitcode for process in processes]
 
 
 def test_run_migrations_creates_tables(tmp_path) -> None:
@@ -16,3 +48,53 @@ def test_run_migrations_creates_tables(tmp_path) -> None:
     finally:
         conn.close()
     assert {"trades", "equity_curve", "metrics_daily"}.issubset(names)
+
+
+def test_run_migrations_records_schema_version(tmp_path) -> None:
+    db_path = tmp_path / "versioned.db"
+    run_migrations(f"sqlite:///{db_path}")
+    conn = sqlite3.connect(db_path)
+    try:
+        assert schema_version(conn) == SCHEMA_VERSION
+    finally:
+        conn.close()
+
+
+def test_ensure_migrated_runs_once_per_process(tmp_path, monkeypatch) -> None:
+    url = f"sqlite:///{tmp_path / 'once.db'}"
+    calls: list[str] = []
+    monkeypatch.setattr(migrations, "run_migrations", lambda db_url: calls.append(db_url))
+    migrations.ensure_migrated(url)
+    migrations.ensure_migrated(url)
+    assert calls == [url]
+
+
+def test_concurrent_migrations_upgrade_v1_database_once(tmp_path) -> None:
+    db_path = tmp_path / "v1.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        for statement in SCHEMA_STATEMENTS:
+            conn.execute(statement.format(schema="main"))
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert _run_concurrently(_migrate_after, f"sqlite:///{db_path}") == [0] * CONCURRENT_MIGRATORS
+    conn = sqlite3.connect(db_path)
+    try:
+        assert schema_version(conn) == SCHEMA_VERSION
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(equity_curve)")]
+    finally:
+        conn.close()
+    assert columns.count("price") == 1
+
+
+def test_concurrent_ensure_migrated_on_fresh_database(tmp_path) -> None:
+    db_path = tmp_path / "fresh.db"
+    assert _run_concurrently(_ensure_after, f"sqlite:///{db_path}") == [0] * CONCURRENT_MIGRATORS
+    conn = sqlite3.connect(db_path)
+    try:
+        assert schema_version(conn) == SCHEMA_VERSION
+    finally:
+        conn.close()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import os
+import queue
+import signal
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import time
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+import pytest
+from apps.bot.board import PriceBoard, timeframe_seconds
+from apps.bot.supervisor import QueueDatabase, Supervisor, run_db_writer, shard_symbols
+from apps.common.config import BotConfig
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Runs an unbounded supervisor and reports the child pids once every worker has written a tick.
+SUPERVISOR_SCRIPT = textwrap.dedent(
+    """
+    import sqlite3, sys, threading, time
+    from pathlib import Path
+    from apps.bot.supervisor import Supervisor
+    from tests.unit.test_supervisor import _fixed_price, _supervisor_config
+
+    tmp_path = Path(sys.argv[1])
+    supervisor = Supervisor(
+        _supervisor_config(tmp_path), ["BTCUSDT", "ETHUSDT"], workers=2, fetch_price=_fixed_price
+    )
+
+    def report() -> None:
+        while True:
+            time.sleep(0.1)
+            try:
+                conn = sqlite3.connect(tmp_path / "supervisor.db")
+                runs = conn.execute("SELECT COUNT(DISTINCT run_id) FROM equity_curve").fetchone()
+                conn.close()
+            except sqlite3.Error:
+                continue
+            if runs[0] == 2:
+                pids = [process.pid for process in supervisor._processes.values()]
+                (tmp_path / "pids").write_text(" ".join(map(str, pids)))
+                return
+
+    threading.Thread(target=report, daemon=True).start()
+    supervisor.run()
+    """
+)
+
+
+async def _fixed_price(symbol: str) -> float:
+    return 100.0 + len(symbol)
+
+
+def _first_feed_call() -> bool:
+    try:
+        Path(os.environ["TDI_TEST_FEED_MARKER"]).touch(exist_ok=False)
+    except FileExistsError:
+        return False
+    return True
+
+
+async def _flaky_price(symbol: str) -> float:
+    # Crash the first feed process once so the supervisor has to restart it.
+    if _first_feed_call():
+        raise RuntimeError("feed crashed")
+    return 100.0
+
+
+def test_shard_symbols_round_robin() -> None:
+    assert shard_symbols(["A", "B", "C"], 2) == [("A", "C"), ("B",)]
+    assert shard_symbols(["A"], 4) == [("A",)]
+    with pytest.raises(ValueError):
+        shard_symbols(["A"], 0)
+
+
+def test_price_board_tracks_price_and_candle() -> None:
+    board = PriceBoard.create(["BTCUSDT", "ETHUSDT"])
+    try:
+        reader = PriceBoard.attach(board.name, board.symbols)
+        assert reader.read("BTCUSDT") is None
+        hour = timeframe_seconds("1h")
+        board.write("BTCUSDT", 7_200.0, 100.0, hour)
+        board.write("BTCUSDT", 7_260.0, 105.0, hour)
+        board.write("BTCUSDT", 7_320.0, 98.0, hour)
+        quote = reader.read("BTCUSDT")
+        assert quote is not None
+        assert (quote.price, quote.open, quote.high, quote.low) == (98.0, 100.0, 105.0, 98.0)
+        board.write("BTCUSDT", 10_800.0, 99.0, hour)
+        quote = reader.read("BTCUSDT")
+        assert quote is not None
+        assert (quote.candle_start, quote.open, quote.high) == (10_800.0, 99.0, 99.0)
+        assert reader.read("ETHUSDT") is None
+        reader.close()
+    finally:
+        board.close()
+        board.unlink()
+
+
+def test_price_board_recovers_slot_left_mid_write() -> None:
+    board = PriceBoard.create(["BTCUSDT"])
+    try:
+        hour = timeframe_seconds("1h")
+        board.write("BTCUSDT", 7_200.0, 100.0, hour)
+        # A feed killed between the two counter updates leaves the slot odd.
+        board._buf[0] += 1
+        with pytest.raises(RuntimeError):
+            board.read("BTCUSDT")
+        board.write("BTCUSDT", 7_260.0, 105.0, hour)
+        quote = board.read("BTCUSDT")
+        assert quote is not None
+        assert (quote.price, quote.open, quote.high) == (105.0, 105.0, 105.0)
+        board.write("BTCUSDT", 7_320.0, 110.0, hour)
+        quote = board.read("BTCUSDT")
+        assert quote is not None
+        assert (quote.open, quote.high) == (105.0, 110.0)
+    finally:
+        board.close()
+        board.unlink()
+
+
+def test_db_writer_applies_queued_writes(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'writer.db'}"
+    write_queue: queue.Queue = queue.Queue()
+    database = QueueDatabase(path=tmp_path / "writer.db", write_queue=write_queue)
+    now = datetime.now(UTC)
+    for _ in range(3):
+        database.insert_equity_point("run", now, 100.0, 0.0, price=1.0)
+    database.upsert_daily_metrics(
+        "run",
+        date.today(),
+        win_rate=0.0,
+        avg_r=0.0,
+        expectancy=0.0,
+        max_dd=0.0,
+        sharpe=0.0,
+        trades_count=0,
+    )
+    write_queue.put(None)
+    run_db_writer(url, write_queue)
+    conn = sqlite3.connect(tmp_path / "writer.db")
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM equity_curve").fetchone()[0] == 3
+        assert conn.execute("SELECT COUNT(*) FROM metrics_daily").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def _supervisor_config(tmp_path) -> BotConfig:
+    return BotConfig(
+        mode="paper",
+        db_url=f"sqlite:///{tmp_path / 'supervisor.db'}",
+        kill_switch_file=tmp_path / "kill",
+        poll_interval_seconds=0,
+        run_id="sup",
+    )
+
+
+def _equity_counts(tmp_path) -> dict[str, int]:
+    conn = sqlite3.connect(tmp_path / "supervisor.db")
+    try:
+        rows = conn.execute("SELECT run_id, COUNT(*) FROM equity_curve GROUP BY run_id")
+        return dict(rows.fetchall())
+    finally:
+        conn.close()
+
+
+def test_supervisor_runs_sharded_workers(tmp_path) -> None:
+    config = _supervisor_config(tmp_path)
+    supervisor = Supervisor(
+        config, ["BTCUSDT", "ETHUSDT", "SOLUSDT"], workers=2, max_ticks=3, fetch_price=_fixed_price
+    )
+    supervisor.run()
+    assert _equity_counts(tmp_path) == {"sup_BTCUSDT": 3, "sup_ETHUSDT": 3, "sup_SOLUSDT": 3}
+    assert supervisor.restarts == {}
+
+
+def test_supervisor_restarts_crashed_feed(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("TDI_TEST_FEED_MARKER", str(tmp_path / "crashed"))
+    config = _supervisor_config(tmp_path)
+    supervisor = Supervisor(config, ["BTCUSDT"], workers=1, max_ticks=2, fetch_price=_flaky_price)
+    supervisor.run()
+    assert supervisor.restarts == {"feed": 1}
+    assert _equity_counts(tmp_path) == {"sup_BTCUSDT": 2}
+
+
+def _start_supervisor(tmp_path) -> tuple[subprocess.Popen, list[int]]:
+    process = subprocess.Popen(  # noqa: S603
+        [sys.executable, "-c", SUPERVISOR_SCRIPT, str(tmp_path)], cwd=REPO_ROOT
+    )
+    deadline = time.monotonic() + 30
+    while not (tmp_path / "pids").exists():
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            pytest.fail("supervisor did not start its workers")
+        time.sleep(0.05)
+    return process, [int(pid) for pid in (tmp_path / "pids").read_text().split()]
+
+
+def _running(pid: int) -> bool:
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except FileNotFoundError:
+        return False
+    return state not in ("Z", "X")
+
+
+def _wait_exited(pids: list[int], timeout: float) -> list[int]:
+    deadline = time.monotonic() + timeout
+    while (alive := [pid for pid in pids if _running(pid)]) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return alive
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="needs procfs")
+def test_sigterm_stops_children_and_drains_writer(tmp_path) -> None:
+    process, pids = _start_supervisor(tmp_path)
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=30) == 0
+    assert _wait_exited(pids, timeout=5) == []
+    counts = _equity_counts(tmp_path)
+    time.sleep(0.3)
+    assert _equity_counts(tmp_path) == counts
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="needs procfs")
+def test_children_exit_when_supervisor_is_killed(tmp_path) -> None:
+    process, pids = _start_supervisor(tmp_path)
+    process.kill()
+    process.wait(timeout=10)
+    assert _wait_exited(pids, timeout=15) == []
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from apps.bot.migrations import run_migrations
+from apps.common.config import WebConfig
+from apps.common.database import TradeCursor, create_database
+from apps.web import main
+
+BASE_TS = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _seed(tmp_path):
+    url = f"sqlite:///{tmp_path / 'trades.db'}"
+    run_migrations(url)
+    db = create_database(url)
+    for run_id in ("run_a", "run_b"):
+        for i in range(7):
+            db.insert_trade(
+                run_id=run_id,
+                ts=BASE_TS + timedelta(minutes=i),
+                side="buy" if i % 2 == 0 else "sell",
+                qty=1.0,
+                entry=100.0 + i,
+                exit=None,
+                pnl=None,
+                fees=0.1,
+                r_multiple=None,
+                reason_in="tdi_cross" if i < 4 else "breakout",
+                reason_out="stop" if i == 6 else None,
+            )
+    return url, db
+
+
+def test_iter_trades_filters(tmp_path) -> None:
+    _, db = _seed(tmp_path)
+    rows = list(db.iter_trades(run_id="run_a", side="buy"))
+    assert [row["entry"] for row in rows] == [100.0, 102.0, 104.0, 106.0]
+
+    rows = list(db.iter_trades(reason="stop"))
+    assert {row["run_id"] for row in rows} == {"run_a", "run_b"}
+
+    rows = list(
+        db.iter_trades(
+            run_id="run_b",
+            since=BASE_TS + timedelta(minutes=2),
+            until=BASE_TS + timedelta(minutes=4),
+        )
+    )
+    assert [row["entry"] for row in rows] == [102.0, 103.0]
+
+
+def test_iter_trades_keyset_pages_cover_all_rows(tmp_path) -> None:
+    _, db = _seed(tmp_path)
+    seen: list[int] = []
+    after = None
+    while True:
+        page = list(db.iter_trades(after=after, limit=4))
+        if not page:
+            break
+        seen.extend(row["id"] for row in page)
+        after = TradeCursor.from_row(page[-1])
+    assert seen == [row["id"] for row in db.iter_trades()]
+    assert len(seen) == 14
+
+
+def test_trade_cursor_round_trip() -> None:
+    cursor = TradeCursor(run_id="run_a", ts=BASE_TS.isoformat(), id=42)
+    assert TradeCursor.decode(cursor.encode()) == cursor
+    with pytest.raises(ValueError):
+        TradeCursor.decode("not-a-cursor")
+
+
+def _get(app, path: str, query: str = "") -> tuple[str, dict]:
+    statuses: list[str] = []
+    chunks = app(
+        {"PATH_INFO": path, "QUERY_STRING": query},
+        lambda status, headers: statuses.append(status),
+    )
+    return statuses[0], json.loads(b"".join(chunks))
+
+
+def test_trades_api_pages_with_cursor(tmp_path) -> None:
+    url, _ = _seed(tmp_path)
+    app = main.create_app(WebConfig(db_url=url))
+
+    status, payload = _get(app, "/api/trades", "run_id=run_a&limit=3")
+    assert status.startswith("200")
+    entries = [trade["entry"] for trade in payload["trades"]]
+    while payload["next_cursor"]:
+        query = f"run_id=run_a&limit=3&cursor={payload['next_cursor']}"
+        _, payload = _get(app, "/api/trades", query)
+        entries.extend(trade["entry"] for trade in payload["trades"])
+    assert entries == [100.0 + i for i in range(7)]
+
+
+def test_trades_api_rejects_bad_params(tmp_path) -> None:
+    url, _ = _seed(tmp_path)
+    app = main.create_app(WebConfig(db_url=url))
+    status, payload = _get(app, "/api/trades", "limit=0")
+    assert status.startswith("400")
+    assert "limit" in payload["error"]
+    status, _ = _get(app, "/api/trades", "since=yesterday")
+    assert status.startswith("400")
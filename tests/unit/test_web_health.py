@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import json
+import os
+import subprocess
+import sys
 from io import BytesIO
+from pathlib import Path
 
+from apps.common.config import WebConfig
 from apps.web import main
 
+ROOT = Path(__file__).resolve().parents[2]
+
 
 def _call_app(path: str) -> tuple[str, list[tuple[str, str]], bytes]:
     status_container: list[str] = []
@@ -37,3 +44,24 @@ def test_healthz_returns_ok() -> None:
     assert status.startswith("200")
     payload = json.loads(body.decode())
     assert payload["status"] == "ok"
+
+
+def test_import_has_no_database_side_effects(tmp_path) -> None:
+    db_path = tmp_path / "lazy.db"
+    env = {**os.environ, "DB_URL": f"sqlite:///{db_path}"}
+    subprocess.run(  # noqa: S603
+        [sys.executable, "-c", "import apps.web.main"], check=True, env=env, cwd=ROOT
+    )
+    assert not db_path.exists()
+
+
+def test_create_app_migrates_on_first_use(tmp_path) -> None:
+    db_path = tmp_path / "factory.db"
+    app = main.create_app(WebConfig(db_url=f"sqlite:///{db_path}", run_id="r1"))
+    assert not db_path.exists()
+    status_container: list[str] = []
+    chunks = app({"PATH_INFO": "/"}, lambda status, headers: status_container.append(status))
+    body = b"".join(chunks)
+    assert status_container[0].startswith("200")
+    assert b"r1" in body
+    assert db_path.exists()